@@ -1,116 +1,1810 @@
 #!/usr/bin/env python3
 import os
+import re
 import sys
 import json
+import math
+import time
+import gzip
+import heapq
+import random
+import signal
+import bisect
+import functools
+import argparse
+import threading
 import subprocess
 from pathlib import Path
+from datetime import datetime
+from xml.etree import ElementTree
 
-def run_command(cmd, cwd=None):
+try:
+    import brotli  # optional: brotli sizes next to gzip for frontend assets
+except ImportError:
+    brotli = None
+
+from laravel_quality_cache import AnalysisCache, content_key
+from laravel_quality_scanner import ContentScanner
+
+ENV_EXAMPLE_KEY_RE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][\w.]*)\s*=", re.MULTILINE)
+
+MAX_INCLUDE_DEPTH = 4
+MAX_INCLUDE_FANOUT = 15
+
+# Upper bounds in seconds; a check that runs out of time is reported as skipped
+RUN_TIMEOUT = 300
+CHECK_TIMEOUT = 60
+
+# Quick mode (--budget): per-file checks run on a stratified random sample
+# sized from a conservative uncached scan rate, using half of the budget
+QUICK_FILES_PER_SECOND = 500
+MIN_STRATUM_SAMPLE = 20
+CENSUS_DIRS = ("routes", "config", "bootstrap")  # small and exact-only: never sampled
+Z_95 = 1.96
+
+DEPLOY_CACHE_COMMANDS = ("config:cache", "route:cache", "view:cache", "event:cache")
+DEPLOY_FILES = ("composer.json", "Dockerfile", "Envoy.blade.php", "deploy.php", "deploy.sh", "Procfile")
+
+# Blocking work in the request path, by scanner signature
+METHOD_DEF_RE = re.compile(r"function\s+(\w+)\s*\(")
+THIS_CALL_RE = re.compile(r"\$this->(\w+)\s*\(")
+USE_IMPORT_RE = re.compile(r"^\s*use\s+\\?([\w\\]+)(?:\s+as\s+(\w+))?\s*;", re.MULTILINE)
+CONCRETE_CLASS_RE = re.compile(r"^\s*(?:final\s+|readonly\s+)*class\s+\w+", re.MULTILINE)
+CONTROLLER_NAMESPACE = "App\\Http\\Controllers\\"
+BLOCKING_SIGNATURES = {
+    "sync_mail": "mail",
+    "http_call": "HTTP call",
+    "guzzle_client": "HTTP call",
+    "pdf_render": "PDF",
+    "sync_dispatch": "sync dispatch",
+}
+RESOURCE_METHODS = {
+    "resource": ("index", "create", "store", "show", "edit", "update", "destroy"),
+    "apiResource": ("index", "store", "show", "update", "destroy"),
+}
+
+# Unbounded Eloquent reads: where they are looked for, what bounds them and
+# how much each context raises a finding's rank
+UNBOUNDED_READ_DIRS = ("app/Http/Controllers", "app/Jobs", "app/Console", "app/Actions")
+BOUNDING_METHODS = {"limit", "take", "paginate", "simplePaginate", "cursorPaginate", "forPage"}
+# The last call of a builder assignment that leaves it a query, not results
+QUERY_BUILDER_RE = re.compile(r"query|newQuery|latest|oldest|(?:or)?[wW]here\w*|with\w*|select\w*|orderBy\w*|join\w*|leftJoin\w*|groupBy")
+NON_MODEL_CLASSES = {"Arr", "Cache", "Collection", "Config", "Cookie", "Input", "Request", "Session", "Storage", "Str"}
+READ_CONTEXT_WEIGHTS = {"loop": 3, "export": 2, "scheduled command": 2}
+EXPORT_RE = re.compile(r"export|download|csv|xlsx|excel|report", re.IGNORECASE)
+BLOCK_RE = re.compile(
+    r"\b(?:(foreach|for|while)\s*\(|function\s+(\w+)\s*\()|->(?:each|map|transform)\s*\(\s*(?:static\s+)?(fn|function)\b|([{}])|\n"
+)
+ROUTE_NAME_TOKEN_RE = re.compile(
+    r"(?:->|Route::)name\(\s*['\"]([^'\"]+)['\"]\s*\)|['\"]as['\"]\s*=>\s*['\"]([^'\"]+)['\"]|(\{)|(\})|;"
+)
+SCHEDULE_LINE_RE = re.compile(r"^.*(?:\$schedule->|Schedule::).*$", re.MULTILINE)
+ITERATED_READ_RE = re.compile(r"(?:all|get)\s*\(\s*\)\s*->\s*(?:each|map|transform|filter)\s*\(")
+COMMAND_SIGNATURE_RE = re.compile(r"\$signature\s*=\s*['\"]([\w:-]+)")
+
+# Test suite speed from JUnit XML reports (phpunit --log-junit, Pest), looked
+# for where phpunit.xml logs them and in the usual places
+JUNIT_REPORTS = ("junit.xml", "build/junit.xml", "build/logs/junit.xml", "reports/junit.xml", "storage/logs/junit.xml")
+PHPUNIT_CONFIGS = ("phpunit.xml", "phpunit.xml.dist", "phpunit.dist.xml")
+PHPUNIT_JUNIT_RE = re.compile(
+    r"<junit\b[^>]*\boutputFile=['\"]([^'\"]+)|<log\b(?=[^>]*\btype=['\"]junit['\"])[^>]*\btarget=['\"]([^'\"]+)"
+)
+SLOW_TEST_SECONDS = 1.0
+SLOW_SUITE_SECONDS = 300
+TEST_KIND_RE = re.compile(r"(?:^|[\\/.])(Feature|Unit)(?:[\\/.]|$)")
+TEST_FILE_RE = re.compile(r"(?:^|[\\/])(tests[\\/][^:]+?\.php)")
+# Tests that write to the database, and the traits that reset it between tests
+DB_ASSERTIONS = (
+    "assertDatabaseHas", "assertDatabaseMissing", "assertDatabaseCount", "assertDatabaseEmpty",
+    "assertModelExists", "assertModelMissing", "assertSoftDeleted", "assertNotSoftDeleted",
+)
+FACTORY_WRITES = ("createMany", "createOne", "createQuietly", "create")
+DB_ISOLATION_TRAITS = {"RefreshDatabase", "LazilyRefreshDatabase", "DatabaseTransactions", "DatabaseMigrations", "DatabaseTruncation"}
+PEST_USES_RE = re.compile(r"\b(?:uses|pest)\s*\([^;]*;")
+PEST_IN_RE = re.compile(r"->\s*in\s*\(([^)]*)\)")
+QUOTED_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+
+# Frontend bundles from the Vite or Mix build manifest. Budgets are compressed
+# KB: an entry's initial JS (entry plus static imports) and CSS, any single JS
+# chunk, and the initial JS above which an app without lazy chunks is flagged
+VITE_MANIFESTS = ("public/build/manifest.json", "public/build/.vite/manifest.json")
+MIX_MANIFEST = "public/mix-manifest.json"
+FRONTEND_BUILD_FILES = ("vite.config.js", "vite.config.ts", "vite.config.mjs", "webpack.mix.js")
+ASSET_BUDGETS = {"entry": 200, "css": 50, "chunk": 150, "split": 100}
+# The levels web servers typically compress responses at
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+# Every content-based check registers its signatures here; each file is read
+# and matched once per assessment no matter how many checks use it.
+SCANNER = ContentScanner()
+SCANNER.register("test_case", [
+    r"function\s+test\w*\s*\(",
+    r"@test\b",
+    r"#\[Test\]",
+    r"\n[ \t]*(?:test|it)\s*\(\s*['\"]",  # Pest
+])
+# Calls that touch the database from a test: DB:: facade calls, ->create()
+# (except on fakes such as UploadedFile::fake()), ->seed() and database
+# assertions. Names in strings and imports (route('posts.create'),
+# use ...\DB;) are not calls, so they do not count.
+SCANNER.register("db_test_write", [
+    r"DB::\w+\s*\(",
+    r"->(?<!fake\(\)->)\s*(?:" + "|".join(FACTORY_WRITES) + r")\s*\(",
+    r"->\s*seed\s*\(",
+    r"assert(?<!\wassert)(?:" + "|".join(name[len("assert"):] for name in DB_ASSERTIONS) + r")\s*\(",
+])
+SCANNER.register("inline_validation", [r"\$request->validate\(", r"Validator::make\("])
+# [line] for Model::all(), [line, first call, its arguments, rest of chain]
+# for a static query chain ending in ->get(). Chains are matched in a
+# lookahead so calls inside them stay visible to other signatures; two levels
+# of nested parentheses are enough for where() closures.
+QUERY_ARGS = r"\((?:[^()]|\((?:[^()]|\([^()]*\))*\))*\)"
+CALL_CHAIN = r"((?:\s*->\s*\w+\s*" + QUERY_ARGS + r")*?)"
+SCANNER.register("unbounded_read", [
+    r"::(?<=\w::)all\s*\(\s*\)",
+    r"::(?<=\w::)(?=(\w+)\s*(" + QUERY_ARGS + r")" + CALL_CHAIN + r"\s*->\s*get\s*\(\s*\))",
+])
+# [line, variable, rest of chain] for $var->...->get(), and [line, variable,
+# model, first call, rest of chain] for $var = Model::query()... so reads of
+# relationships and of builders kept in a variable are found too
+SCANNER.register("instance_read", r"\$(?=(\w+)" + CALL_CHAIN + r"\s*->\s*get\s*\(\s*\))")
+SCANNER.register(
+    "query_builder",
+    r"\$(?=(\w+)\s*=\s*(\w+)\s*::\s*(\w+)\s*" + QUERY_ARGS + r"((?:\s*->\s*\w+\s*" + QUERY_ARGS + r")*)\s*;)",
+)
+# [line, key or None for dynamic keys, "," when a default is given]; the
+# lookbehind comes after "env" so the alternative still starts with a literal
+SCANNER.register(
+    "env_call",
+    r"env(?<![\w>:$@]env)\s*\(\s*(?:['\"]([\w.]+)['\"]\s*(,)?)?",
+    kinds=("php", "blade"),
+)
+ROUTE_PREFIX = (
+    r"(?:get|post|put|patch|delete|options|any|match)\s*\(\s*(?:\[[^\]]*\]\s*,\s*)?"
+    r"['\"][^'\"]*['\"]\s*,\s*"
+)
+ROUTE_CLOSURE = ROUTE_PREFIX + r"(?:static\s+)?(?:function|fn)\b"
+SCANNER.register("route_closure", ["Route::" + ROUTE_CLOSURE, "->" + ROUTE_CLOSURE])
+# [line, class, method, invokable class, 'X@m' class, 'X@m' method], with the
+# groups of the other two action forms None
+ROUTE_ACTION = ROUTE_PREFIX + (
+    r"(?:\[\s*([\w\\]+)::class\s*,\s*['\"](\w+)['\"]\s*\]|([\w\\]+)::class\s*\)|['\"]([\w\\]+)@(\w+)['\"])"
+)
+SCANNER.register("route_action", ["Route::" + ROUTE_ACTION, "->" + ROUTE_ACTION])
+ROUTE_RESOURCE = r"(resource|apiResource)\s*\(\s*['\"][^'\"]*['\"]\s*,\s*([\w\\]+)::class"
+SCANNER.register("route_resource", ["Route::" + ROUTE_RESOURCE, "->" + ROUTE_RESOURCE])
+SCANNER.register("route_name", r"->name\(\s*['\"]([^'\"]+)['\"]\s*\)")
+SCANNER.register("config_closure", r"=>\s*(?:static\s+)?(?:function|fn)\s*\(")
+SCANNER.register("event_discovery", [
+    r"function\s+shouldDiscoverEvents\s*\(\s*\)[^{]*\{\s*return\s+true",
+    r"withEvents\s*\(\s*discover",
+])
+SCANNER.register(
+    "blade_include",
+    r"@(?:include|includeIf|includeWhen|includeUnless|includeFirst|extends|each|component)"
+    r"\s*\(\s*(?:[^'\")]*?,\s*|\[\s*)?['\"]([\w.:/-]+)['\"]",
+    kinds=("blade",),
+)
+# One hit per query: each alternative consumes the rest of its chain, so the
+# trailing ->get() is not counted again; helper facades are not queries
+QUERY_CHAIN = QUERY_ARGS + r"(?:\s*->\s*\w+\s*" + QUERY_ARGS + r")*"
+SCANNER.register("blade_query", [
+    r"DB::\w+\s*" + QUERY_CHAIN,
+    r"::(?<=\w::)" + "".join(rf"(?<!\b{c}::)" for c in sorted(NON_MODEL_CLASSES))
+    + r"(?:where\w*|all|find\w*|first\w*|query|paginate)\s*" + QUERY_CHAIN,
+    r"->get\(\s*\)",
+], kinds=("blade",))
+SCANNER.register("blade_relation_loop", r"@foreach\s*\(\s*\$\w+->\w+\s+as\b", kinds=("blade",))
+# Work that blocks the request; [line, mailable] for mail. Every alternative
+# starts with a capital, "::" or "->" so the scan does not stop at each
+# common lowercase letter.
+SCANNER.register("sync_mail", [
+    r"Mail::(?:send|raw|html|plain)\s*\(\s*(?:new\s+([\w\\]+))?",
+    r"Mail::(?:to|cc|bcc|mailer)\s*\([^;]*?->\s*send\s*\(\s*(?:new\s+([\w\\]+))?",
+])
+# [line, class] for classes that implement ShouldQueue; importing the
+# interface, as the make:mail stub does, does not queue a class
+SCANNER.register(
+    "queued_class",
+    r"class(?<!::class)(?<![\w$>]class)\s+(\w+)[^{;]*\bimplements\b[^{;]*\bShouldQueue\b",
+)
+SCANNER.register("http_call", [
+    r"Http::\w+\s*\(",
+])
+SCANNER.register("guzzle_client", r"Client(?<!\wClient)\s*\(")
+SCANNER.register("pdf_render", [
+    r"Pdf::\w+\s*\(",
+    r"PDF::\w+\s*\(",
+    r"SnappyPdf::\w+\s*\(",
+    r"Browsershot::\w+\s*\(",
+    r"Dompdf(?<!\wDompdf)\s*\(",
+    r"Mpdf(?<!\wMpdf)\s*\(",
+])
+SCANNER.register("sync_dispatch", [r"::(?<=\w::)dispatch(?:Sync|Now)\s*\(", r"->dispatch(?:Sync|Now)\s*\("])
+
+SOURCE_DIRS = ("app", "routes", "config", "database", "tests", "resources/views")
+
+def kill_process_tree(proc):
+    # composer and friends spawn children that would keep our pipes open
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        pass
     try:
-        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=False)
-        return result.stdout.strip()
+        proc.kill()
+    except OSError:
+        pass
+
+def run_command(cmd, cwd=None, control=None):
+    try:
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                start_new_session=(os.name != "nt"))
     except:
         return ""
+    if control is None:
+        return proc.communicate()[0].strip()
 
-def assess_laravel_project(project_path):
-    path = Path(project_path).resolve()
-    if not path.exists():
-        print("❌ Project path does not exist!")
-        return
+    control.track(proc)
+    try:
+        stdout, _ = proc.communicate(timeout=control.remaining())
+    except subprocess.TimeoutExpired:
+        kill_process_tree(proc)
+        try:
+            proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        raise CheckTimeout()
+    finally:
+        control.untrack(proc)
+    control.checkpoint()  # killed by cancel(): its output is meaningless
+    return stdout.strip()
 
-    if not (path / "artisan").exists() or not (path / "composer.json").exists():
-        print("❌ This doesn't look like a Laravel project (missing artisan or composer.json)")
-        return
+def parse_asset_budget(value):
+    """Parse NAME=KB for --asset-budget"""
+    name, _, kb = value.partition("=")
+    if name not in ASSET_BUDGETS or not re.fullmatch(r"\d+(?:\.\d+)?", kb):
+        raise argparse.ArgumentTypeError(f"invalid asset budget: {value!r} (use {'|'.join(ASSET_BUDGETS)}=KB)")
+    return name, float(kb)
+
+def parse_duration(value):
+    """Parse '2s', '500ms', '1m' or plain seconds"""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*", value)
+    if not m:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r}")
+    return float(m.group(1)) * {"ms": 0.001, "s": 1, "m": 60, None: 1}[m.group(2)]
+
+def walk_project(path, checkpoint=None):
+    """List all PHP sources, tests and Blade views of a project"""
+    files = []
+    for d in SOURCE_DIRS:
+        for f in (path / d).rglob("*.php"):
+            files.append(f)
+            if checkpoint is not None and len(files) % 500 == 0:
+                checkpoint()
+    if (path / "bootstrap" / "app.php").exists():
+        files.append(path / "bootstrap" / "app.php")
+    return files
+
+def stratum_of(path, f):
+    parts = f.relative_to(path).parts
+    return "/".join(parts[:2]) if len(parts) > 2 else parts[0]
+
+def sample_files(path, files, fraction, rng):
+    """Stratified random sample by top-level directory.
+
+    Returns {stratum: (all files, sampled files)}.
+    """
+    by_stratum = {}
+    for f in files:
+        by_stratum.setdefault(stratum_of(path, f), []).append(f)
+    strata = {}
+    for stratum, members in sorted(by_stratum.items()):
+        n = max(MIN_STRATUM_SAMPLE, math.ceil(len(members) * fraction))
+        if stratum.split("/")[0] in CENSUS_DIRS or n >= len(members):
+            strata[stratum] = (members, members)
+        else:
+            strata[stratum] = (members, rng.sample(members, n))
+    return strata
+
+def scan_project(path, cache=None, checkpoint=None, budget=None, pool=None):
+    """Scan a project in a single pass, or a stratified sample of it under a time budget.
+
+    pool is an optional process pool to scan in, shared with other scans.
+    Returns (scanned, strata); strata is None when every file was scanned.
+    """
+    files = walk_project(path, checkpoint)
+    strata = None
+    if budget is not None and files:
+        fraction = QUICK_FILES_PER_SECOND * budget * 0.5 / len(files)
+        if fraction < 1:
+            # Seeded per project so repeated quick runs hit the cache
+            strata = sample_files(path, files, fraction, random.Random(str(path)))
+            files = [f for _, sampled in strata.values() for f in sampled]
+    return SCANNER.scan_files(files, cache, checkpoint, pool), strata
+
+def format_estimate(value, half_width=None):
+    """Exact counts print as-is; sampled estimates always carry ~ and a margin"""
+    if half_width is None:
+        return str(round(value))
+    return f"~{round(value)} ±{math.ceil(half_width)}"
+
+def format_kb(size):
+    return f"{size / 1024:.1f} KB"
+
+@functools.lru_cache(maxsize=256)
+def directory_prefix(directory):
+    return os.path.join(str(directory), "")
+
+def is_under(f, directory):
+    # String prefix test: Path.parents builds a new path per level and is far
+    # too slow to call for every file in every check
+    return str(f).startswith(directory_prefix(directory))
+
+def chain_methods(chain):
+    return re.findall(r"->\s*(\w+)\s*\(", chain)
+
+def hits_in(scanned, name, under=None):
+    """Yield (file, hit) for one signature, optionally limited to a directory"""
+    for f, result in scanned.items():
+        if under is not None and not is_under(f, under):
+            continue
+        for hit in result["hits"].get(name, ()):
+            yield f, hit
+
+def include_closure(graph):
+    """Include depth and the set of reachable views for every view.
+
+    Include cycles are condensed into strongly connected components first
+    (iterative Tarjan, so long chains cannot exhaust the stack). Every view in
+    a cycle reaches the others but never counts itself, and the results do not
+    depend on the order views were found in.
+    """
+    index, low, on_stack, stack, components = {}, {}, set(), [], []
+    for root in sorted(graph):
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]["includes"]))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            name, children = work[-1]
+            for child in children:
+                if child not in graph:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child]["includes"])))
+                    break
+                if child in on_stack:
+                    low[name] = min(low[name], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[name])
+                if low[name] == index[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    components.append(component)
+
+    # Tarjan emits components children first, so each one's includes are done
+    component_of = {name: i for i, component in enumerate(components) for name in component}
+    depths, reachable = {}, {}
+    for i, component in enumerate(components):
+        seen = set(component) if len(component) > 1 else set()
+        depth = 0
+        for name in component:
+            for child in graph[name]["includes"]:
+                if child not in graph:
+                    seen.add(child)  # missing view: a leaf
+                    depth = max(depth, 1)
+                elif component_of[child] != i:
+                    seen.add(child)
+                    seen |= reachable[child]
+                    depth = max(depth, depths[child] + 1)
+                else:
+                    seen.add(child)
+        # A cycle adds the longest simple path through it
+        depth += len(component) - 1
+        for name in component:
+            depths[name] = depth
+            reachable[name] = seen - {name}
+    return depths, reachable
+
+def analyze_blade_views(views_dir, analyses):
+    """Build per-view reports from analysed Blade files, most expensive first"""
+    graph = {}
+    for f, result in analyses.items():
+        if not is_under(f, views_dir) or not f.name.endswith(".blade.php"):
+            continue
+        name = f.relative_to(views_dir).as_posix()[:-len(".blade.php")].replace("/", ".")
+        hits = result["hits"]
+        graph[name] = {
+            "queries": [h[0] for h in hits["blade_query"]],
+            "relation_loops": [h[0] for h in hits["blade_relation_loop"]],
+            "includes": sorted(set(h[1].replace("/", ".") for h in hits["blade_include"])),
+        }
+
+    depths, reachable = include_closure(graph)
+
+    reports = []
+    for name, analysis in graph.items():
+        depth, seen = depths[name], reachable[name]
+        included = [graph[v] for v in seen if v in graph]
+        queries = len(analysis["queries"]) + sum(len(v["queries"]) for v in included)
+        loops = len(analysis["relation_loops"]) + sum(len(v["relation_loops"]) for v in included)
+        reports.append({
+            "view": name,
+            "own_queries": analysis["queries"],
+            "own_relation_loops": analysis["relation_loops"],
+            "queries": queries,
+            "relation_loops": loops,
+            "include_depth": depth,
+            "include_fanout": len(seen),
+            "cost": queries * 10 + loops * 5 + len(seen) + depth * 2,
+        })
+    reports.sort(key=lambda r: (-r["cost"], r["view"]))
+    return reports
+
+def full_route_names(text):
+    """Yield (line, name) for each named route with its group prefixes applied.
+
+    A name prefix (->name('admin.'), Route::name('admin.'), 'as' => 'admin.')
+    applies to the braces of the group closure that follows it in the same
+    statement.
+    """
+    prefixes = []  # one entry per open brace
+    pending = ""
+    line, last = 1, 0
+    for m in ROUTE_NAME_TOKEN_RE.finditer(text):
+        name = m.group(1) or m.group(2)
+        if name is not None:
+            if name.endswith("."):
+                pending += name
+            else:
+                line += text.count("\n", last, m.start())
+                last = m.start()
+                yield line, "".join(prefixes) + name
+        elif m.group(3):
+            prefixes.append(pending)
+            pending = ""
+        elif m.group(4):
+            if prefixes:
+                prefixes.pop()
+        else:
+            pending = ""
+
+def optimization_readiness(path, composer_json, scanned):
+    """Statically check whether php artisan optimize can cache routes, config and events"""
+    blockers = []
+
+    for f, hit in hits_in(scanned, "route_closure", path / "routes"):
+        blockers.append((f.relative_to(path).as_posix(), hit[0], "closure route blocks route:cache"))
+
+    # Names are only compared once their group prefixes are applied
+    route_files = sorted({f for f, _ in hits_in(scanned, "route_name", path / "routes")})
+    route_names = {}
+    for f in route_files:
+        rel = f.relative_to(path).as_posix()
+        for line, name in full_route_names(f.read_text(errors="replace")):
+            if name in route_names:
+                blockers.append((rel, line, f"route name '{name}' already used at {route_names[name]}"))
+            else:
+                route_names[name] = f"{rel}:{line}"
+
+    for f, hit in hits_in(scanned, "config_closure", path / "config"):
+        blockers.append((f.relative_to(path).as_posix(), hit[0], "closure in config blocks config:cache"))
+    blockers.sort()
+
+    config = composer_json.get("config", {})
+    autoloader_optimized = bool(config.get("optimize-autoloader") or config.get("classmap-authoritative"))
+
+    event_discovery = any(
+        f in (path / "app" / "Providers" / "EventServiceProvider.php", path / "bootstrap" / "app.php")
+        for f, _ in hits_in(scanned, "event_discovery")
+    )
+
+    deploy_text = ""
+    deploy_paths = [path / name for name in DEPLOY_FILES]
+    deploy_paths += list((path / ".github" / "workflows").glob("*.y*ml"))
+    for deploy_file in deploy_paths:
+        if deploy_file.is_file():
+            deploy_text += deploy_file.read_text(errors="replace")
+    if "artisan optimize" in deploy_text:
+        deploy_caches = set(DEPLOY_CACHE_COMMANDS)
+    else:
+        deploy_caches = {c for c in DEPLOY_CACHE_COMMANDS if c in deploy_text}
+
+    return {
+        "blockers": blockers,
+        "autoloader_optimized": autoloader_optimized,
+        "event_discovery": event_discovery,
+        "deploy_caches": deploy_caches,
+    }
+
+def read_contexts(text, lines):
+    """Enclosing method and loop state at the end of each of the given lines"""
+    contexts = {}
+    stack = []        # kind of block each open brace belongs to
+    pending = None    # block kind waiting for its opening brace
+    line = 1
+    for m in BLOCK_RE.finditer(text):
+        loop, method, callback, brace = m.groups()
+        if loop or callback:
+            pending = "loop"
+        elif method:
+            pending = "function " + method
+        elif brace == "{":
+            stack.append(pending or "block")
+            pending = None
+        elif brace == "}":
+            if stack:
+                stack.pop()
+        else:
+            if line in lines:
+                methods = [kind[len("function "):] for kind in stack if kind.startswith("function ")]
+                contexts[line] = {
+                    "method": methods[-1] if methods else None,
+                    "in_loop": "loop" in stack or pending == "loop",
+                }
+            line += 1
+    return contexts
+
+def unbounded_reads(path, scanned):
+    """Model::all() and ->get() query chains without a limit, most risky first"""
+    schedule = "\n".join(
+        line
+        for f in (path / "app" / "Console" / "Kernel.php", path / "routes" / "console.php", path / "bootstrap" / "app.php")
+        if f.is_file()
+        for line in SCHEDULE_LINE_RE.findall(f.read_text(errors="replace"))
+    )
+
+    candidates = {}
+    for directory in UNBOUNDED_READ_DIRS:
+        under = path / directory
+        for f, hit in hits_in(scanned, "unbounded_read", under):
+            if len(hit) == 1:
+                read = {"line": hit[0], "static": r"all\s*\(\s*\)", "methods": ["all"]}
+            else:
+                read = {
+                    "line": hit[0],
+                    "static": re.escape(hit[1]) + r"\s*" + re.escape(hit[2]),
+                    "methods": [hit[1]] + chain_methods(hit[3]),
+                }
+            candidates.setdefault(f, []).append(read)
+        # Builders assigned to a variable and read later in the same file
+        builders = {}
+        for f, hit in hits_in(scanned, "query_builder", under):
+            methods = [hit[3]] + chain_methods(hit[4])
+            if QUERY_BUILDER_RE.fullmatch(methods[-1]):
+                builders.setdefault(f, {})[hit[1]] = (hit[2], methods)
+        for f, hit in hits_in(scanned, "instance_read", under):
+            var, methods = hit[1], chain_methods(hit[2])
+            if var in builders.get(f, {}):
+                model, built = builders[f][var]
+                candidates.setdefault(f, []).append(
+                    {"line": hit[0], "model": model, "var": var, "methods": built + methods}
+                )
+            elif var not in ("this", "request") and methods and re.match(r"\s*->\s*\w+\s*\(\s*\)", hit[2]):
+                # $user->orders()->get(): a relationship read
+                candidates.setdefault(f, []).append(
+                    {"line": hit[0], "model": f"${var}->{methods[0]}()", "methods": methods}
+                )
+
+    findings = []
+    for f, reads in candidates.items():
+        text = f.read_text(errors="replace")
+        source_lines = text.split("\n")
+        line_starts = [0]
+        for source_line in source_lines:
+            line_starts.append(line_starts[-1] + len(source_line) + 1)
+        contexts = read_contexts(text, {read["line"] for read in reads})
+        signature = COMMAND_SIGNATURE_RE.search(text)
+        scheduled = is_under(f, path / "app" / "Console") or is_under(f, path / "app" / "Jobs")
+        scheduled = scheduled and bool(
+            re.search(rf"\b{re.escape(f.stem)}\b", schedule)
+            or signature and re.search(rf"['\"]{re.escape(signature.group(1))}[\s'\"]", schedule)
+        )
+        occurrences = {}
+        for read in reads:
+            line = read["line"]
+            if "var" in read and re.search(
+                rf"\${read['var']}\s*(?:=\s*\${read['var']}\s*)?->\s*(?:{'|'.join(BOUNDING_METHODS)})\s*\(", text
+            ):
+                continue
+            if BOUNDING_METHODS.intersection(read["methods"]):
+                continue
+            if "static" in read:
+                # The class in front of this hit's own call, not the first X:: on the line
+                key = (line, read["static"])
+                nth = occurrences[key] = occurrences.get(key, -1) + 1
+                calls = list(re.finditer(r"(\w+)\s*::\s*" + read["static"], text[line_starts[line - 1]:]))
+                read["model"] = calls[nth].group(1) if nth < len(calls) else "Model"
+                if read["model"] in NON_MODEL_CLASSES:
+                    continue
+            model, first = read["model"], read["methods"][0]
+            context = contexts.get(line, {"method": None, "in_loop": False})
+            labels = []
+            if context["in_loop"] or ITERATED_READ_RE.search(source_lines[line - 1]):
+                labels.append("loop")
+            if EXPORT_RE.search(f.stem) or (context["method"] and EXPORT_RE.search(context["method"])):
+                labels.append("export")
+            if scheduled:
+                labels.append("scheduled command")
+            filtered = first != "all" and any(m.startswith("where") for m in read["methods"])
+
+            if "loop" in labels or "export" in labels:
+                replacement = "lazy()"
+            elif is_under(f, path / "app" / "Http" / "Controllers"):
+                replacement = "paginate()"
+            else:
+                replacement = "chunkById(1000, ...)"
+            if first == "all" and "static" in read:
+                call = f"{model}::all()"
+                replacement = f"{model}::{replacement}"
+            elif "var" in read:
+                call = f"${read['var']} = {model}::{first}(…); ${read['var']}->get()"
+                replacement = f"->{replacement} instead of ->get()"
+            elif "static" in read:
+                call = f"{model}::{first}(…)->get()"
+                replacement = f"->{replacement} instead of ->get()"
+            else:
+                call = f"{model}->get()" if len(read["methods"]) == 1 else f"{model}->…->get()"
+                replacement = f"->{replacement} instead of ->get()"
+            findings.append({
+                "path": f,
+                "file": f.relative_to(path).as_posix(),
+                "line": line,
+                "call": call,
+                "context": labels,
+                "replacement": replacement,
+                "rank": sum(READ_CONTEXT_WEIGHTS[label] for label in labels) + (0 if filtered else 1),
+            })
+    findings.sort(key=lambda r: (-r["rank"], r["file"], r["line"]))
+    return findings
+
+def class_name(reference):
+    return reference.rsplit("\\", 1)[-1]
+
+def class_fqcn(f, app_dir):
+    """Fully qualified class name of a file under app/ (PSR-4)"""
+    return "App\\" + "\\".join(f.relative_to(app_dir).with_suffix("").parts)
+
+def blocking_calls(path, scanned, f, queued, imports):
+    """Yield (line, label) for each call in a file that blocks until its work is done.
+
+    queued holds the fully qualified names of classes implementing
+    ShouldQueue; imports caches each file's use statements.
+    """
+    app_dir = path / "app"
+    namespace = class_fqcn(f, app_dir).rsplit("\\", 1)[0] + "\\" if is_under(f, app_dir) else ""
+    tokens = None
+    for name, label in BLOCKING_SIGNATURES.items():
+        for hit in scanned[f]["hits"].get(name, ()):
+            target = hit[1] if len(hit) > 1 else None
+            if name == "sync_mail" and target and resolve_class(target, use_imports(f, imports), namespace) in queued:
+                continue  # a queued Mailable is queued by send() too
+            if name == "guzzle_client":
+                if tokens is None:
+                    tokens = set(scanned[f]["tokens"])
+                if "GuzzleHttp" not in tokens:
+                    continue
+            yield hit[0], label
+
+def queueable(f, result, app_dir):
+    """Concrete job or mailable classes; not job middleware, bases, traits or interfaces"""
+    tokens = set(result["tokens"])
+    if is_under(f, app_dir / "Mail"):
+        if "Mailable" not in tokens:
+            return False
+    elif "handle" not in tokens or "next" in tokens:  # job middleware handles ($job, $next)
+        return False
+    return bool(CONCRETE_CLASS_RE.search(f.read_text(errors="replace")))
+
+def use_imports(f, cache):
+    """{alias: fully qualified class} from a PHP file's use statements"""
+    if f not in cache:
+        cache[f] = {
+            alias or name.rsplit("\\", 1)[-1]: name
+            for name, alias in USE_IMPORT_RE.findall(f.read_text(errors="replace"))
+        }
+    return cache[f]
+
+def resolve_class(reference, imports, namespace=CONTROLLER_NAMESPACE):
+    """Fully qualified name of a class reference, as PHP resolves it in a file.
+
+    namespace is the file's own (with a trailing backslash); routes files
+    default to the controllers namespace.
+    """
+    if reference.startswith("\\"):
+        return reference[1:]
+    head, _, rest = reference.partition("\\")
+    if head in imports:
+        return imports[head] + ("\\" + rest if rest else "")
+    if reference.startswith("App\\"):
+        return reference
+    return namespace + reference
+
+def request_path_blocking(path, scanned):
+    """Rank route handlers by the blocking calls reachable from them.
+
+    Handlers are controller methods named by routes (including resource
+    routes and invokable controllers) and route closures. Calls made through
+    $this-> helpers of the same controller count towards the handler.
+    """
+    app_dir = path / "app"
+    controllers_dir = app_dir / "Http" / "Controllers"
+    routes_dir = path / "routes"
+    queued_dirs = (app_dir / "Jobs", app_dir / "Mail")
+    # Classes are keyed by fully qualified name, so Admin\UserController and
+    # UserController stay apart; references resolve through use imports
+    queued = set()
+    unqueued = []
+    for f, result in scanned.items():
+        if not is_under(f, app_dir):
+            continue
+        declared = result["hits"].get("queued_class", ())
+        namespace = class_fqcn(f, app_dir).rsplit("\\", 1)[0]
+        queued.update(f"{namespace}\\{hit[1]}" for hit in declared)
+        if not declared and any(is_under(f, d) for d in queued_dirs) and queueable(f, result, app_dir):
+            unqueued.append(f.relative_to(path).as_posix())
+    unqueued.sort()
+
+    imports = {}
+    routes = {}
+    for f, (line, controller, method, invokable, legacy_controller, legacy_method) in hits_in(
+        scanned, "route_action", routes_dir
+    ):
+        if invokable:
+            controller, method = invokable, "__invoke"
+        elif legacy_controller:
+            controller, method = CONTROLLER_NAMESPACE + legacy_controller, legacy_method
+        controller = resolve_class(controller, use_imports(f, imports))
+        routes.setdefault((controller, method), f"{f.relative_to(path).as_posix()}:{line}")
+    for f, (line, kind, controller) in hits_in(scanned, "route_resource", routes_dir):
+        controller = resolve_class(controller, use_imports(f, imports))
+        for method in RESOURCE_METHODS[kind]:
+            routes.setdefault((controller, method), f"{f.relative_to(path).as_posix()}:{line}")
+
+    # Per controller method: blocking calls and the same-class methods it
+    # calls. Only controllers with a blocking call are read again for these.
+    methods = {}
+    for f in scanned:
+        if not is_under(f, controllers_dir):
+            continue
+        calls = list(blocking_calls(path, scanned, f, queued, imports))
+        if not calls:
+            continue
+        fqcn = class_fqcn(f, app_dir)
+        text = f.read_text(errors="replace")
+        starts = []
+        line = 1
+        last = 0
+        for m in METHOD_DEF_RE.finditer(text):
+            line += text.count("\n", last, m.start())
+            last = m.start()
+            starts.append((line, m.group(1)))
+
+        def owner(line):
+            index = bisect.bisect_right(starts, (line, "\uffff")) - 1
+            return (fqcn, starts[index][1]) if index >= 0 else None
+
+        for line, label in calls:
+            method = owner(line)
+            if method:
+                methods.setdefault(method, ([], set()))[0].append(label)
+        line = 1
+        last = 0
+        for m in THIS_CALL_RE.finditer(text):
+            line += text.count("\n", last, m.start())
+            last = m.start()
+            method = owner(line)
+            if method:
+                methods.setdefault(method, ([], set()))[1].add((fqcn, m.group(1)))
+
+    handlers = []
+    for (controller, method), route in routes.items():
+        labels = []
+        seen = set()
+        stack = [(controller, method)]
+        while stack:
+            current = stack.pop()
+            if current in seen or current not in methods:
+                continue
+            seen.add(current)
+            labels += methods[current][0]
+            stack.extend(methods[current][1])
+        if labels:
+            short = controller[len(CONTROLLER_NAMESPACE):] if controller.startswith(CONTROLLER_NAMESPACE) else controller
+            handlers.append({"handler": f"{short}@{method}", "route": route, "calls": labels})
+
+    # Route closures handle requests too
+    for f, result in scanned.items():
+        if not is_under(f, routes_dir):
+            continue
+        closures = sorted(hit[0] for hit in result["hits"].get("route_closure", ()))
+        by_closure = {}
+        for line, label in blocking_calls(path, scanned, f, queued, imports):
+            index = bisect.bisect_right(closures, line) - 1
+            if index >= 0:
+                by_closure.setdefault(closures[index], []).append(label)
+        for line, labels in by_closure.items():
+            rel = f"{f.relative_to(path).as_posix()}:{line}"
+            handlers.append({"handler": "closure", "route": rel, "calls": labels})
+
+    handlers.sort(key=lambda h: (-len(h["calls"]), h["handler"]))
+    return {"handlers": handlers, "unqueued": unqueued}
+
+def junit_reports(path, given=()):
+    """JUnit XML reports to read: the given ones (relative to the project), or
+    the newest of those configured in phpunit.xml and in the usual places.
+    Several given reports are summed, e.g. one per parallel CI shard.
+    """
+    if given:
+        return [path / report for report in given if (path / report).is_file()]
+    candidates = []
+    for name in PHPUNIT_CONFIGS:
+        config = path / name
+        if config.is_file():
+            for output_file, target in PHPUNIT_JUNIT_RE.findall(config.read_text(errors="replace")):
+                candidates.append(path / (output_file or target))
+    candidates.extend(path / name for name in JUNIT_REPORTS)
+    found = [report for report in candidates if report.is_file()]
+    return [max(found, key=lambda report: report.stat().st_mtime)] if found else []
+
+def test_kind(*names):
+    """'Feature' or 'Unit' from the first test file, class or suite name that says"""
+    for name in names:
+        m = TEST_KIND_RE.search(name) if name else None
+        if m:
+            return m.group(1)
+    return None
+
+def parse_junit(reports, checkpoint=None, top=10):
+    """Stream test timings out of JUnit XML reports.
+
+    Every element is detached from the tree as soon as it ends, so memory
+    stays flat however large a report is; only the per-class and per-file
+    totals and the slowest tests are kept.
+    """
+    timings = {"tests": 0, "seconds": 0.0, "slow": 0, "kinds": {}, "classes": {}, "files": {}, "errors": []}
+    slowest = []  # min-heap of (seconds, order, test)
+    located = {}  # (file attribute, class) -> (project-relative file, kind); tests of a class share both
+    for report in reports:
+        suites = []
+        open_elements = []
+        try:
+            for event, elem in ElementTree.iterparse(report, events=("start", "end")):
+                if event == "start":
+                    open_elements.append(elem)
+                    if elem.tag == "testsuite":
+                        suites.append((elem.get("name", ""), elem.get("file", "")))
+                    continue
+                open_elements.pop()
+                if elem.tag == "testsuite":
+                    suites.pop()
+                elif elem.tag == "testcase":
+                    seconds = float(elem.get("time") or 0)
+                    suite, suite_file = suites[-1] if suites else ("", "")
+                    test_class = elem.get("class") or elem.get("classname", "").replace(".", "\\") or suite
+                    file_attr = elem.get("file") or suite_file
+                    if (file_attr, test_class) not in located:
+                        m = TEST_FILE_RE.search(file_attr)
+                        rel = m.group(1).replace("\\", "/") if m else None
+                        located[file_attr, test_class] = (rel, test_kind(rel, test_class))
+                    rel, kind = located[file_attr, test_class]
+                    if kind is None:
+                        kind = test_kind(*(name for name, _ in reversed(suites)))
+                    timings["tests"] += 1
+                    timings["seconds"] += seconds
+                    timings["kinds"][kind] = timings["kinds"].get(kind, 0.0) + seconds
+                    totals = timings["classes"].setdefault(test_class, [0.0, 0])
+                    totals[0] += seconds
+                    totals[1] += 1
+                    if rel:
+                        timings["files"][rel] = timings["files"].get(rel, 0.0) + seconds
+                    if seconds > SLOW_TEST_SECONDS:
+                        timings["slow"] += 1
+                    if len(slowest) < top:
+                        heapq.heappush(slowest, (seconds, timings["tests"], f"{test_class}::{elem.get('name', '?')}"))
+                    elif seconds > slowest[0][0]:
+                        heapq.heapreplace(slowest, (seconds, timings["tests"], f"{test_class}::{elem.get('name', '?')}"))
+                    if checkpoint is not None and timings["tests"] % 1000 == 0:
+                        checkpoint()
+                elem.clear()
+                if open_elements:
+                    open_elements[-1].remove(elem)
+        except (ElementTree.ParseError, OSError) as e:
+            timings["errors"].append(f"{report.name}: {e}")
+    timings["slowest"] = [(test, seconds) for seconds, _, test in sorted(slowest, reverse=True)]
+    return timings
+
+def isolated_test_dirs(path):
+    """Test directories reset between tests by the base TestCase or tests/Pest.php"""
+    tests_dir = path / "tests"
+    base = tests_dir / "TestCase.php"
+    if base.is_file() and any(t in base.read_text(errors="replace") for t in DB_ISOLATION_TRAITS):
+        return [tests_dir]
+    dirs = []
+    pest = tests_dir / "Pest.php"
+    if pest.is_file():
+        for statement in PEST_USES_RE.findall(pest.read_text(errors="replace")):
+            if not any(t in statement for t in DB_ISOLATION_TRAITS):
+                continue
+            targets = PEST_IN_RE.search(statement)
+            if targets:
+                dirs.extend(tests_dir / d for d in QUOTED_RE.findall(targets.group(1)))
+            else:
+                dirs.append(tests_dir)
+    return dirs
+
+def shares_database(f, result, isolated_dirs):
+    """Whether a test file writes to the database without resetting it"""
+    if not f.name.endswith("Test.php"):
+        return False
+    tokens = set(result["tokens"])
+    if tokens & DB_ISOLATION_TRAITS or any(is_under(f, d) for d in isolated_dirs):
+        return False
+    return bool(result["hits"].get("db_test_write"))
+
+def compressed_sizes(data, cache=None):
+    """gzip (and brotli, when installed) sizes of a file, cached by content"""
+    key = content_key(data, "lq-asset")
+    sizes = cache.get(key) if cache is not None else None
+    # Entries cached before brotli was installed lack its size
+    if sizes is None or (brotli is not None and "brotli" not in sizes):
+        sizes = {"gzip": len(gzip.compress(data, GZIP_LEVEL, mtime=0))}
+        if brotli is not None:
+            sizes["brotli"] = len(brotli.compress(data, quality=BROTLI_QUALITY))
+        if cache is not None:
+            cache.put(key, sizes)
+    return sizes
+
+def chunk_stem(file):
+    """A build file's name without directory, extension or content hash"""
+    stem = os.path.splitext(os.path.basename(file.split("?", 1)[0]))[0]
+    # Vite and Rollup name chunks [name]-[hash] with an 8 character hash
+    return stem[:-9] if len(stem) > 9 and stem[-9] == "-" else stem
+
+def load_build_manifest(path):
+    """(manifest file, tool, {key: chunk}) for the Vite or Mix manifest, or None.
+
+    Chunks are normalised to Vite's shape: file relative to the build
+    directory, plus isEntry, imports, dynamicImports and css. They are None
+    when the manifest is not valid JSON (e.g. a build that was interrupted).
+    """
+    for name in VITE_MANIFESTS:
+        manifest = path / name
+        if manifest.is_file():
+            return manifest, "Vite", read_json_object(manifest)
+    manifest = path / MIX_MANIFEST
+    if manifest.is_file():
+        # Mix maps "/js/app.js" to "/js/app.js?id=..." and has no import graph
+        listed = read_json_object(manifest)
+        chunks = None if listed is None else {
+            key: {"file": value.split("?", 1)[0].lstrip("/"), "isEntry": True}
+            for key, value in listed.items()
+            if key.endswith((".js", ".css")) and isinstance(value, str)
+        }
+        return manifest, "Mix", chunks
+    return None
 
-    score = 100
-    feedback = []
+def read_json_object(file):
+    """A JSON file's top-level object, or None when it is unreadable or not an object"""
+    try:
+        value = json.loads(file.read_text(errors="replace"))
+    except (OSError, ValueError):
+        return None
+    return value if isinstance(value, dict) else None
+
+def asset_weight(path, cache=None, budgets=ASSET_BUDGETS, checkpoint=None):
+    """Measure every build entry with the chunks it loads up front.
+
+    Returns None without a manifest, else a dict with one row per entry
+    (raw and compressed JS and CSS of the entry and its static imports),
+    the lazy chunks, duplicated vendor chunks and files missing on disk;
+    just manifest, tool and invalid=True when the manifest cannot be read.
+    Budgets are gzip KB, the compression every web server offers; brotli
+    sizes are reported next to them when brotli is installed.
+    """
+    found = load_build_manifest(path)
+    if found is None:
+        return None
+    manifest, tool, chunks = found
+    if chunks is None:
+        return {"manifest": manifest.relative_to(path).as_posix(), "tool": tool, "invalid": True}
+    build_dir = manifest.parent.parent if manifest.parent.name == ".vite" else manifest.parent
+    compression = "gzip"
+    sizes = {}
+    missing = []
+
+    def measure(file):
+        if file not in sizes:
+            if checkpoint is not None:
+                checkpoint()
+            try:
+                data = (build_dir / file).read_bytes()
+            except OSError:
+                missing.append(file)
+                data = None
+            sizes[file] = None if data is None else dict(
+                compressed_sizes(data, cache), raw=len(data), digest=content_key(data, "lq-asset-file")
+            )
+        return sizes[file]
+
+    def total(files, kind):
+        measured = [measure(f) for f in files]
+        return sum(m[kind] for m in measured if m)
+
+    entries = []
+    for key, chunk in chunks.items():
+        if not chunk.get("isEntry"):
+            continue
+        # Static imports load with the entry; dynamic imports are lazy chunks
+        js, css, seen = [], [], set()
+        stack = [key]
+        while stack:
+            current = stack.pop()
+            if current in seen or current not in chunks:
+                continue
+            seen.add(current)
+            file = chunks[current]["file"]
+            (css if file.endswith(".css") else js).append(file)
+            css.extend(chunks[current].get("css", ()))
+            stack.extend(chunks[current].get("imports", ()))
+        css = list(dict.fromkeys(css))
+        row = {
+            "entry": chunk.get("src", key),
+            "js": total(js, "raw"),
+            "js_compressed": total(js, compression),
+            "css": total(css, "raw"),
+            "css_compressed": total(css, compression),
+            "js_brotli": total(js, "brotli") if brotli is not None else None,
+            "css_brotli": total(css, "brotli") if brotli is not None else None,
+            "chunks": len(js),
+            "lazy": len(chunk.get("dynamicImports", ())),
+        }
+        row["over"] = []
+        if row["js_compressed"] > budgets["entry"] * 1024:
+            row["over"].append("entry")
+        if row["css_compressed"] > budgets["css"] * 1024:
+            row["over"].append("css")
+        entries.append(row)
+    entries.sort(key=lambda e: -(e["js_compressed"] + e["css_compressed"]))
+
+    js_files = sorted({c["file"] for c in chunks.values() if c["file"].endswith(".js")})
+    large_chunks = [
+        (file, sizes[file][compression]) for file in js_files
+        if measure(file) and sizes[file][compression] > budgets["chunk"] * 1024
+    ]
+    if tool == "Vite":
+        lazy = [key for key, c in chunks.items() if c.get("isDynamicEntry")]
+    else:
+        # Mix only lists versioned entries; webpack's lazy chunks sit next to them
+        listed = {build_dir / c["file"] for c in chunks.values()}
+        lazy = [f for f in (build_dir / "js").rglob("*.js") if f not in listed] if (build_dir / "js").is_dir() else []
+
+    # Vendor code shipped twice: byte-identical chunks, vendor chunks split
+    # under the same name more than once, or Mix entries without extract()
+    package_json = path / "package.json"
+    packages = set()
+    spec = read_json_object(package_json) if package_json.is_file() else None
+    for section in ("dependencies", "devDependencies"):
+        dependencies = (spec or {}).get(section)
+        if isinstance(dependencies, dict):
+            packages.update(name.rsplit("/", 1)[-1] for name in dependencies)
+    by_digest, by_stem = {}, {}
+    for key, c in chunks.items():
+        file = c["file"]
+        if not file.endswith(".js") or not measure(file):
+            continue
+        by_digest.setdefault(sizes[file]["digest"], set()).add(file)
+        stem = chunk_stem(file)
+        if stem.startswith("vendor") or stem in packages or "node_modules" in c.get("src", ""):
+            by_stem.setdefault(stem, set()).add(file)
+    duplicates = [sorted(files) for files in by_digest.values() if len(files) > 1]
+    duplicates += [sorted(files) for files in by_stem.values() if len(files) > 1 and sorted(files) not in duplicates]
+    if tool == "Mix" and not any(chunk_stem(f) == "vendor" for f in js_files):
+        heavy = [e["entry"] for e in entries if e["js_compressed"] > budgets["split"] * 1024]
+        if len(heavy) > 1:
+            duplicates.append(heavy)
+
+    initial = max((e["js_compressed"] for e in entries), default=0)
+    return {
+        "manifest": manifest.relative_to(path).as_posix(),
+        "tool": tool,
+        "compression": compression,
+        "budgets": dict(budgets),
+        "entries": entries,
+        "large_chunks": large_chunks,
+        "lazy_chunks": len(lazy),
+        "unsplit": not lazy and initial > budgets["split"] * 1024,
+        "duplicates": duplicates,
+        "missing": sorted(set(missing)),
+    }
+
+class CheckTimeout(Exception):
+    pass
+
+class CheckSkipped(Exception):
+    """Raised by a check that cannot run in this mode; the message is the reason"""
+
+class AssessmentCancelled(Exception):
+    pass
+
+class RunControl:
+    """Deadlines and cancellation for one assessment run.
+
+    Checks call checkpoint() at safe points; it raises CheckTimeout once the
+    current check or the whole run is out of time and AssessmentCancelled
+    after cancel(). Child processes started through run_command are killed
+    on cancel.
+    """
+
+    def __init__(self, timeout=RUN_TIMEOUT, check_timeout=CHECK_TIMEOUT):
+        self.check_timeout = check_timeout
+        self.run_deadline = time.monotonic() + timeout if timeout else None
+        self.check_deadline = self.run_deadline
+        self.cancelled = threading.Event()
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def start_check(self):
+        deadline = time.monotonic() + self.check_timeout if self.check_timeout else None
+        if self.run_deadline is not None:
+            deadline = self.run_deadline if deadline is None else min(deadline, self.run_deadline)
+        self.check_deadline = deadline
+
+    def run_expired(self):
+        return self.run_deadline is not None and time.monotonic() >= self.run_deadline
+
+    def remaining(self):
+        if self.check_deadline is None:
+            return None
+        return max(0.0, self.check_deadline - time.monotonic())
+
+    def checkpoint(self):
+        if self.cancelled.is_set():
+            raise AssessmentCancelled()
+        if self.check_deadline is not None and time.monotonic() >= self.check_deadline:
+            raise CheckTimeout()
+
+    def cancel(self):
+        self.cancelled.set()
+        with self._lock:
+            for proc in list(self._processes):
+                kill_process_tree(proc)
+
+    def track(self, proc):
+        with self._lock:
+            self._processes.add(proc)
+        if self.cancelled.is_set():
+            kill_process_tree(proc)
+
+    def untrack(self, proc):
+        with self._lock:
+            self._processes.discard(proc)
 
-    # 1. .env example exists, .env not committed
+class Assessment:
+    """State shared by the checks of one project assessment"""
+
+    def __init__(self, path, cache=None, control=None, budget=None, junit_reports=(), asset_budgets=None,
+                 scan_pool=None):
+        self.path = path
+        self.cache = cache
+        self.scan_pool = scan_pool
+        self.control = control or RunControl()
+        self.budget = budget
+        self.junit_reports = junit_reports
+        self.asset_budgets = dict(ASSET_BUDGETS, **(asset_budgets or {}))
+        self.assets = None
+        self.score = 100
+        self.feedback = []
+        self.skipped = []
+        self.checks = {}
+        self.metrics = {}
+        self.strata = None
+        self.scan = {"status": "skipped", "files": 0, "seconds": 0.0}
+        self._scanned = None
+        self._composer_json = None
+
+    @property
+    def has_scan(self):
+        return self._scanned is not None
+
+    @property
+    def scanned(self):
+        # Filled by scan_step() before the checks run; without it every
+        # content check is skipped instead of retrying the walk
+        if self._scanned is None:
+            raise CheckSkipped("no project scan")
+        return self._scanned
+
+    @property
+    def sampled(self):
+        return self.scanned is not None and self.strata is not None
+
+    def file_count(self, under):
+        """Exact number of project files under a directory, sampled or not"""
+        if not self.sampled:
+            return sum(1 for f in self.scanned if is_under(f, under))
+        return sum(1 for members, _ in self.strata.values() for f in members if is_under(f, under))
+
+    def estimate(self, per_file, under=None):
+        """Total of per_file(file, result) over the project, with a 95% CI half-width.
+
+        under limits the total to a directory or a tuple of directories.
+        Exact (half-width None) unless the run is sampled, in which case the
+        stratified estimator sums N_h * mean_h with variance
+        N_h^2 * (1 - n_h/N_h) * s_h^2 / n_h per stratum. A stratum whose
+        sample is all zeros has no variance, so it adds a rule-of-three
+        bound of 3/n_h per unsampled file under `under` instead.
+        """
+        dirs = (under,) if isinstance(under, Path) else under
+
+        def included(f):
+            return dirs is None or any(is_under(f, d) for d in dirs)
+
+        def value(f):
+            if not included(f):
+                return 0
+            return per_file(f, self.scanned[f]) if f in self.scanned else 0
+
+        if not self.sampled:
+            return sum(value(f) for f in self.scanned), None
+        total = 0.0
+        variance = 0.0
+        bound = 0.0
+        for members, sampled in self.strata.values():
+            population = len(members)
+            values = [value(f) for f in sampled]
+            n = len(values)
+            if not n:
+                continue
+            mean = sum(values) / n
+            total += population * mean
+            if not any(values):
+                # Only the unsampled files that could hold a hit widen the bound
+                inside = sum(1 for f in members if included(f))
+                bound += (population - n) * 3 / n * inside / population
+            elif n > 1 and n < population:
+                s2 = sum((v - mean) ** 2 for v in values) / (n - 1)
+                variance += population ** 2 * (1 - n / population) * s2 / n
+        return total, Z_95 * math.sqrt(variance) + bound
+
+    def record(self, name, value):
+        """Record a numeric metric for the running check (used by fleet analytics)"""
+        self.metrics[name] = value
+
+    @property
+    def composer_json(self):
+        if self._composer_json is None:
+            self._composer_json = json.loads((self.path / "composer.json").read_text())
+        return self._composer_json
+
+def check_environment(a):
+    path = a.path
+
+    # .env example exists, .env not committed
     if (path / ".env.example").exists():
-        feedback.append("✓ .env.example exists")
+        a.feedback.append("✓ .env.example exists")
     else:
-        score -= 10
-        feedback.append("✗ Missing .env.example")
+        a.score -= 10
+        a.feedback.append("✗ Missing .env.example")
 
     if (path / ".env").exists():
-        git_check = run_command(["git", "check-ignore", ".env"], cwd=path)
+        git_check = run_command(["git", "check-ignore", ".env"], cwd=path, control=a.control)
         if not git_check:
-            score -= 15
-            feedback.append("⚠ .env is tracked in git! (security risk)")
+            a.score -= 15
+            a.feedback.append("⚠ .env is tracked in git! (security risk)")
 
-    # 2. Laravel Pint or PHP CS Fixer
-    composer_json = json.loads((path / "composer.json").read_text())
-    scripts = composer_json.get("scripts", {})
+    if not a.has_scan:
+        a.feedback.append("○ env() calls not checked (no project scan)")
+        return
+
+    # env() outside config/ returns null once config is cached
+    config_dir = path / "config"
+    tests_dir = path / "tests"
+    env_outside_config = []
+    env_keys = set()
+    for f, (line, key, has_default) in hits_in(a.scanned, "env_call"):
+        if is_under(f, tests_dir):
+            continue
+        in_config = is_under(f, config_dir)
+        if not in_config:
+            env_outside_config.append((f.relative_to(path).as_posix(), line, key))
+        if key and (not in_config or not has_default):
+            env_keys.add(key)
+    env_calls, margin = a.estimate(
+        lambda f, r: len(r["hits"]["env_call"]),
+        tuple(path / d for d in SOURCE_DIRS if d not in ("tests", "config")) + (path / "bootstrap",),
+    )
+    if env_outside_config:
+        a.score -= min(10, 2 * round(env_calls))
+        a.feedback.append(f"✗ {format_estimate(env_calls, margin)} env() call(s) outside config/ (null once config is cached)")
+        for rel, line, key in sorted(env_outside_config):
+            a.feedback.append(f"   ↳ {rel}:{line} env({key or '...'})")
+    else:
+        a.feedback.append("✓ No env() calls outside config/")
 
-    if "pint" in str(scripts) or os.path.exists(path / "pint.json"):
-        feedback.append("✓ Laravel Pint is configured")
+    a.record("env_calls_outside_config", round(env_calls))
+
+    if (path / ".env.example").exists():
+        documented = set(ENV_EXAMPLE_KEY_RE.findall((path / ".env.example").read_text(errors="replace")))
+        undocumented = sorted(env_keys - documented)
+        a.record("undocumented_env", len(undocumented))
+        if undocumented:
+            a.score -= 2
+            a.feedback.append(f"⚠ {len(undocumented)} env variable(s) missing from .env.example: {', '.join(undocumented)}")
+
+def check_code_style(a):
+    scripts = a.composer_json.get("scripts", {})
+
+    if "pint" in str(scripts) or os.path.exists(a.path / "pint.json"):
+        a.feedback.append("✓ Laravel Pint is configured")
     elif any("cs-fixer" in s for s in str(scripts)):
-        feedback.append("✓ PHP CS Fixer is configured")
+        a.feedback.append("✓ PHP CS Fixer is configured")
     else:
-        score -= 12
-        feedback.append("✗ No code style fixer (Pint or CS Fixer) detected")
+        a.score -= 12
+        a.feedback.append("✗ No code style fixer (Pint or CS Fixer) detected")
 
-    # 3. Tests exist
-    if (path / "tests").exists() and any((path / "tests").rglob("*.php")):
-        test_count = len(list((path / "tests").rglob("*.php")))
+def check_tests(a):
+    tests_dir = a.path / "tests"
+    test_count = a.file_count(tests_dir)
+    a.record("test_files", test_count)
+    if test_count:
+        estimate = a.estimate(lambda f, r: len(r["hits"].get("test_case", ())), tests_dir)
+        a.record("test_cases", round(estimate[0]))
+        test_cases = format_estimate(*estimate)
         if test_count > 10:
-            feedback.append(f"✓ Great! {test_count} test files found")
+            a.feedback.append(f"✓ Great! {test_count} test files found ({test_cases} test cases)")
         else:
-            score -= 8
-            feedback.append(f"⚠ Only {test_count} test files (consider writing more)")
+            a.score -= 8
+            a.feedback.append(f"⚠ Only {test_count} test files, {test_cases} test cases (consider writing more)")
     else:
-        score -= 20
-        feedback.append("✗ No tests found!")
+        a.score -= 20
+        a.feedback.append("✗ No tests found!")
+
+def check_test_suite(a):
+    # Slow tests from JUnit reports on disk, and tests that leave data behind
+    tests_dir = a.path / "tests"
+    if not a.file_count(tests_dir):
+        return
+    reports = junit_reports(a.path, a.junit_reports)
+    if reports:
+        timings = parse_junit(reports, a.control.checkpoint)
+        for error in timings["errors"]:
+            a.feedback.append(f"⚠ Could not read JUnit report {error}")
+    if reports and timings["tests"]:
+        total = timings["seconds"]
+        a.record("test_suite_seconds", round(total, 1))
+        a.record("slow_tests", timings["slow"])
+        a.record("feature_time_share", round(timings["kinds"].get("Feature", 0) / total, 3) if total else 0)
+        shares = ", ".join(
+            f"{kind or 'other'} {seconds / total:.0%}"
+            for kind, seconds in sorted(timings["kinds"].items(), key=lambda k: -k[1])
+        ) if total else "no timings"
+        summary = f"{timings['tests']} tests took {total:.1f}s ({shares})"
+        if total > SLOW_SUITE_SECONDS:
+            a.score -= 4
+            a.feedback.append(f"✗ {summary}, over the {SLOW_SUITE_SECONDS}s budget")
+        else:
+            a.feedback.append(f"✓ {summary}")
+        if timings["slow"]:
+            a.score -= 2
+            a.feedback.append(f"⚠ {timings['slow']} test(s) slower than {SLOW_TEST_SECONDS:g}s")
+            for test, seconds in [t for t in timings["slowest"] if t[1] > SLOW_TEST_SECONDS][:5]:
+                a.feedback.append(f"   ↳ {test} {seconds:.2f}s")
+        classes = sorted(timings["classes"].items(), key=lambda c: -c[1][0])
+        if total and classes:
+            a.feedback.append("○ Slowest test classes")
+            for test_class, (seconds, count) in classes[:5]:
+                a.feedback.append(f"   ↳ {test_class} {seconds:.1f}s over {count} test(s)")
+    elif not reports:
+        a.feedback.append("○ No JUnit report found (run phpunit --log-junit junit.xml to measure slow tests)")
+
+    isolated_dirs = isolated_test_dirs(a.path)
+    shared, margin = a.estimate(lambda f, r: int(shares_database(f, r, isolated_dirs)), tests_dir)
+    a.record("db_tests_without_reset", round(shared))
+    if shared:
+        files = timings["files"] if reports else {}
+        offenders = sorted(
+            (f.relative_to(a.path).as_posix() for f, r in a.scanned.items()
+             if is_under(f, tests_dir) and shares_database(f, r, isolated_dirs)),
+            key=lambda rel: (-files.get(rel, 0), rel),
+        )
+        a.score -= 3
+        a.feedback.append(
+            f"⚠ {format_estimate(shared, margin)} test file(s) write to the database without "
+            "RefreshDatabase or DatabaseTransactions"
+        )
+        for rel in offenders[:5]:
+            a.feedback.append(f"   ↳ {rel} ({files[rel]:.1f}s)" if rel in files else f"   ↳ {rel}")
 
-    # 4. Thin controllers (average < 100 lines)
-    controllers = list((path / "app" / "Http" / "Controllers").rglob("*.php"))
-    large_controllers = [c for c in controllers if c.stat().st_size > 15000]  # ~500 lines
+def check_controllers(a):
+    # Thin controllers (average < 100 lines)
+    controllers_dir = a.path / "app" / "Http" / "Controllers"
+    large_controllers, margin = a.estimate(lambda f, r: int(r["size"] > 15000), controllers_dir)  # ~500 lines
+    a.record("large_controllers", round(large_controllers))
     if large_controllers:
-        score -= 10
-        feedback.append(f"⚠ {len(large_controllers)} large controller(s) detected")
+        a.score -= 10
+        a.feedback.append(f"⚠ {format_estimate(large_controllers, margin)} large controller(s) detected")
 
-    # 5. Form Requests used?
-    requests = list((path / "app" / "Http" / "Requests").rglob("*.php"))
+def check_form_requests(a):
+    requests = list((a.path / "app" / "Http" / "Requests").rglob("*.php"))
+    a.record("form_requests", len(requests))
     if len(requests) > 3:
-        feedback.append(f"✓ Using Form Requests ({len(requests)} found)")
+        a.feedback.append(f"✓ Using Form Requests ({len(requests)} found)")
     elif len(requests) > 0:
-        feedback.append(f"○ Some Form Requests ({len(requests)})")
+        a.feedback.append(f"○ Some Form Requests ({len(requests)})")
     else:
-        score -= 8
-        feedback.append("✗ No Form Requests – validation likely in controllers")
+        a.score -= 8
+        controllers_dir = a.path / "app" / "Http" / "Controllers"
+        inline, margin = a.estimate(lambda f, r: len(r["hits"].get("inline_validation", ())), controllers_dir)
+        if inline:
+            a.feedback.append(f"✗ No Form Requests – validation likely in controllers "
+                              f"({format_estimate(inline, margin)} inline validate() calls)")
+        else:
+            a.feedback.append("✗ No Form Requests – validation likely in controllers")
 
-    # 6. Migrations look clean
-    migrations = list((path / "database" / "migrations").rglob("*.php"))
+def check_migrations(a):
+    migrations = list((a.path / "database" / "migrations").rglob("*.php"))
+    a.record("migrations", len(migrations))
     if migrations:
-        feedback.append(f"✓ {len(migrations)} migration(s)")
+        a.feedback.append(f"✓ {len(migrations)} migration(s)")
     else:
-        score -= 5
-        feedback.append("✗ No migrations found")
+        a.score -= 5
+        a.feedback.append("✗ No migrations found")
 
-    # 7. Outdated packages?
-    outdated = run_command(["composer", "outdated", "--direct"], cwd=path)
+def check_dependencies(a):
+    # Served from the cache in quick mode; keyed by the lock file so it
+    # refreshes whenever dependencies change
+    lock = a.path / "composer.lock"
+    key = content_key((lock if lock.exists() else a.path / "composer.json").read_bytes(), "lq-composer")
+    cached = a.cache.get(key) if a.cache is not None else None
+    if a.budget is not None:
+        if cached is None:
+            raise CheckSkipped("quick mode")
+        outdated = cached["outdated"]
+    else:
+        outdated = run_command(["composer", "outdated", "--direct"], cwd=a.path, control=a.control)
+        if a.cache is not None:
+            a.cache.put(key, {"outdated": outdated})
     if "0 packages" in outdated.lower():
-        feedback.append("✓ All direct dependencies up to date")
+        a.feedback.append("✓ All direct dependencies up to date")
     elif outdated:
-        score -= 7
-        feedback.append("⚠ Some outdated direct dependencies")
+        a.score -= 7
+        a.feedback.append("⚠ Some outdated direct dependencies")
+
+def check_blade_views(a):
+    # Queries in templates, relationship loops, include chains
+    views_dir = a.path / "resources" / "views"
+    views = analyze_blade_views(views_dir, a.scanned)
+    if not views:
+        return
+    view_count = a.file_count(views_dir)
+    view_queries, query_margin = a.estimate(lambda f, r: len(r["hits"].get("blade_query", ())), views_dir)
+    relation_loops, loop_margin = a.estimate(lambda f, r: len(r["hits"].get("blade_relation_loop", ())), views_dir)
+    # A sampled include graph is incomplete, so depth and fan-out need a full run
+    deep_views = [] if a.sampled else [
+        v for v in views if v["include_depth"] > MAX_INCLUDE_DEPTH or v["include_fanout"] > MAX_INCLUDE_FANOUT
+    ]
+    a.record("view_queries", round(view_queries))
+    a.record("relation_loops", round(relation_loops))
+    a.record("deep_views", len(deep_views))
+    if view_queries:
+        a.score -= 5
+        a.feedback.append(f"✗ {format_estimate(view_queries, query_margin)} query call(s) in Blade views")
+    if relation_loops:
+        a.score -= 3
+        a.feedback.append(f"⚠ {format_estimate(relation_loops, loop_margin)} @foreach loop(s) over relationships in views (possible N+1)")
+    if deep_views:
+        a.score -= 2
+        a.feedback.append(f"⚠ {len(deep_views)} view(s) exceed include depth {MAX_INCLUDE_DEPTH} or fan-out {MAX_INCLUDE_FANOUT}")
+    if not (view_queries or relation_loops or deep_views):
+        a.feedback.append(f"✓ {view_count} Blade views, no queries in templates"
+                          + (f" (sampled, ≤{math.ceil(query_margin)} estimated)" if a.sampled else ""))
+    for v in [v for v in views if v["cost"] > 0][:5]:
+        a.feedback.append(
+            f"   ↳ {v['view']}: {v['queries']} queries, {v['relation_loops']} relationship loops, "
+            f"include depth {v['include_depth']}, fan-out {v['include_fanout']}"
+        )
+
+def check_frontend_assets(a):
+    # Bundle weight from the Vite or Mix build manifest, against the budgets
+    report = asset_weight(a.path, a.cache, a.asset_budgets, a.control.checkpoint)
+    if report is None:
+        if any((a.path / name).exists() for name in FRONTEND_BUILD_FILES):
+            a.feedback.append("○ No build manifest found (run npm run build to measure bundle sizes)")
+        return
+    if report.get("invalid"):
+        a.feedback.append(f"○ {report['manifest']} is not valid JSON (rebuild to measure bundle sizes)")
+        return
+    a.assets = report
+    budgets = report["budgets"]
+    compression = report["compression"]
+    entries = report["entries"]
+    oversized = [e for e in entries if e["over"]]
+    a.record("largest_entry_kb", round(max((e["js_compressed"] for e in entries), default=0) / 1024, 1))
+    a.record("oversized_entries", len(oversized))
+    a.record("large_chunks", len(report["large_chunks"]))
+    a.record("duplicated_vendor_chunks", len(report["duplicates"]))
+    a.record("lazy_chunks", report["lazy_chunks"])
+    if oversized:
+        a.score -= min(8, 4 * len(oversized))
+        a.feedback.append(
+            f"✗ {len(oversized)} entry bundle(s) over budget "
+            f"({budgets['entry']:g} KB JS, {budgets['css']:g} KB CSS {compression})"
+        )
+    elif entries:
+        a.feedback.append(f"✓ {len(entries)} {report['tool']} entry bundle(s) within budget")
+    for e in (oversized or entries)[:5]:
+        brotli_size = "" if e["js_brotli"] is None else f", {format_kb(e['js_brotli'] + e['css_brotli'])} brotli"
+        a.feedback.append(
+            f"   ↳ {e['entry']}: {format_kb(e['js_compressed'])} JS + {format_kb(e['css_compressed'])} CSS {compression} "
+            f"({format_kb(e['js'] + e['css'])} raw{brotli_size}, {e['chunks']} JS chunk(s) up front)"
+        )
+    if report["large_chunks"]:
+        a.score -= 2
+        a.feedback.append(f"⚠ {len(report['large_chunks'])} JS chunk(s) over the {budgets['chunk']:g} KB {compression} budget")
+        for file, size in sorted(report["large_chunks"], key=lambda c: -c[1])[:5]:
+            a.feedback.append(f"   ↳ {file}: {format_kb(size)}")
+    if report["duplicates"]:
+        a.score -= 3
+        a.feedback.append(f"⚠ {len(report['duplicates'])} vendor chunk(s) shipped more than once")
+        for files in report["duplicates"][:5]:
+            a.feedback.append(f"   ↳ {', '.join(files)}")
+    if report["unsplit"]:
+        a.score -= 3
+        a.feedback.append(
+            f"⚠ No code splitting: no lazily loaded chunks and entries load up to "
+            f"{format_kb(max(e['js_compressed'] for e in entries))} of JS up front"
+        )
+    if report["missing"]:
+        a.feedback.append(f"○ {len(report['missing'])} file(s) in {report['manifest']} are missing (stale build?)")
 
-    # 8. Bonus: Uses Laravel actions or resources
-    if (path / "app" / "Actions").exists():
-        feedback.append("✓ Using Actions pattern!")
-        score += 5
-    if (path / "app" / "Http" / "Resources").exists():
-        feedback.append("✓ Using API Resources!")
+def check_unbounded_reads(a):
+    # Model::all() / ->get() without limit, paginate, chunk, cursor or lazy
+    if not any(a.file_count(a.path / d) for d in UNBOUNDED_READ_DIRS):
+        return
+    reads = unbounded_reads(a.path, a.scanned)
+    per_file = {}
+    for r in reads:
+        per_file[r["path"]] = per_file.get(r["path"], 0) + 1
+    count, margin = a.estimate(lambda f, r: per_file.get(f, 0), tuple(a.path / d for d in UNBOUNDED_READ_DIRS))
+    a.record("unbounded_reads", round(count))
+    if not count:
+        a.feedback.append("✓ No unbounded Eloquent reads in controllers, jobs, commands or actions")
+        return
+    risky = [r for r in reads if r["context"]]
+    a.score -= 6 if risky else 3
+    a.feedback.append(
+        f"{'✗' if risky else '⚠'} {format_estimate(count, margin)} unbounded Eloquent read(s) "
+        "in controllers, jobs, commands and actions"
+    )
+    for r in reads[:10]:
+        context = f" [{', '.join(r['context'])}]" if r["context"] else ""
+        a.feedback.append(f"   ↳ {r['file']}:{r['line']} {r['call']}{context} → {r['replacement']}")
+
+def check_request_path(a):
+    # Mail, HTTP calls, PDFs and sync dispatches made while the user waits
+    controllers_dir = a.path / "app" / "Http" / "Controllers"
+    if a.sampled:
+        # Handlers need the full call map; estimate the calls instead
+        count, margin = a.estimate(
+            lambda f, r: sum(len(r["hits"].get(name, ())) for name in BLOCKING_SIGNATURES), controllers_dir
+        )
+        a.record("blocking_calls", round(count))
+        if count:
+            a.score -= 3
+            a.feedback.append(f"⚠ {format_estimate(count, margin)} blocking call(s) (mail, HTTP, PDF, dispatchSync) in controllers")
+        return
+    report = request_path_blocking(a.path, a.scanned)
+    handlers = report["handlers"]
+    a.record("blocking_handlers", len(handlers))
+    a.record("blocking_calls", sum(len(h["calls"]) for h in handlers))
+    a.record("unqueued_classes", len(report["unqueued"]))
+    if handlers:
+        a.score -= min(8, 2 * len(handlers))
+        a.feedback.append(f"✗ {len(handlers)} HTTP handler(s) do slow work synchronously (mail, HTTP, PDF, dispatchSync)")
+        for h in handlers[:5]:
+            counts = {}
+            for label in h["calls"]:
+                counts[label] = counts.get(label, 0) + 1
+            summary = ", ".join(f"{n}× {label}" for label, n in sorted(counts.items(), key=lambda c: -c[1]))
+            a.feedback.append(f"   ↳ {h['handler']} ({h['route']}): {summary}")
+    elif (a.path / "routes").exists():
+        a.feedback.append("✓ No blocking mail, HTTP, PDF or sync dispatch calls in HTTP handlers")
+    if report["unqueued"]:
+        a.score -= 2
+        a.feedback.append(f"⚠ {len(report['unqueued'])} job/mail class(es) do not implement ShouldQueue")
+        for rel in report["unqueued"][:5]:
+            a.feedback.append(f"   ↳ {rel}")
+
+def check_optimization(a):
+    # php artisan optimize: route/config/event caching and autoloader
+    readiness = optimization_readiness(a.path, a.composer_json, a.scanned)
+    a.record("optimize_blockers", len(readiness["blockers"]))
+    if readiness["blockers"]:
+        a.score -= min(10, 2 * len(readiness["blockers"]))
+        a.feedback.append(f"✗ {len(readiness['blockers'])} blocker(s) for php artisan optimize")
+        for rel, line, message in readiness["blockers"]:
+            a.feedback.append(f"   ↳ {rel}:{line} {message}")
+    else:
+        a.feedback.append("✓ Routes and config are cacheable (php artisan optimize)")
+    if readiness["autoloader_optimized"]:
+        a.feedback.append("✓ Composer autoloader is optimized")
+    else:
+        a.score -= 3
+        a.feedback.append("⚠ Composer autoloader not optimized (set optimize-autoloader or classmap-authoritative)")
+    missing_caches = [c for c in DEPLOY_CACHE_COMMANDS if c not in readiness["deploy_caches"]]
+    if readiness["event_discovery"] and "event:cache" in missing_caches:
+        a.feedback.append("○ Event discovery is enabled but event:cache is never run on deploy")
+    if missing_caches:
+        a.feedback.append(f"○ Deploy scripts never run {', '.join(missing_caches)}")
+
+def check_patterns(a):
+    # Bonus: Uses Laravel actions or resources
+    if (a.path / "app" / "Actions").exists():
+        a.feedback.append("✓ Using Actions pattern!")
+        a.score += 5
+    if (a.path / "app" / "Http" / "Resources").exists():
+        a.feedback.append("✓ Using API Resources!")
+
+# (title, check) in report order
+CHECKS = [
+    ("Environment configuration", check_environment),
+    ("Code style", check_code_style),
+    ("Tests", check_tests),
+    ("Test suite", check_test_suite),
+    ("Controller size", check_controllers),
+    ("Form Requests", check_form_requests),
+    ("Migrations", check_migrations),
+    ("Outdated dependencies", check_dependencies),
+    ("Blade views", check_blade_views),
+    ("Frontend assets", check_frontend_assets),
+    ("Unbounded queries", check_unbounded_reads),
+    ("Request path", check_request_path),
+    ("Optimization readiness", check_optimization),
+    ("Laravel patterns", check_patterns),
+]
+
+def check_status(lines):
+    if any(line.startswith("✗") for line in lines):
+        return "fail"
+    if any(line.startswith("⚠") for line in lines):
+        return "warn"
+    return "pass"
+
+def scan_step(a):
+    """Walk and scan the project once, before the checks, under its own deadline.
+
+    Reported separately as a.scan; if it does not finish, the content checks
+    are skipped and the others still run.
+    """
+    if a.control.cancelled.is_set():
+        reason = "cancelled"
+    elif a.control.run_expired():
+        reason = "timeout"
+    else:
+        a.control.start_check()
+        started = time.monotonic()
+        try:
+            a._scanned, a.strata = scan_project(
+                a.path, a.cache, a.control.checkpoint, a.budget, a.scan_pool
+            )
+            a.scan = {"status": "ok", "files": len(a._scanned), "seconds": round(time.monotonic() - started, 2)}
+            return
+        except CheckTimeout:
+            reason = "timeout"
+        except AssessmentCancelled:
+            reason = "cancelled"
+        except Exception as e:
+            reason = f"error: {type(e).__name__}: {e}"
+        a.scan["seconds"] = round(time.monotonic() - started, 2)
+    a.scan["status"] = "error" if reason.startswith("error") else reason
+    a.scan["reason"] = reason
+    a.feedback.append(f"○ Project scan skipped ({reason}); content checks skipped")
+
+def run_check(a, title, check):
+    """Run one check; a check that runs out of time is skipped, not failed.
+
+    Any other exception marks just this check as "error" so the remaining
+    checks still run and a partial report is printed.
+    """
+    a.metrics = {}
+    a.checks[title] = {"status": "skipped", "penalty": 0, "metrics": a.metrics}
+    if a.control.cancelled.is_set():
+        reason = "cancelled"
+    elif a.control.run_expired():
+        reason = "timeout"
+    else:
+        a.control.start_check()
+        score, feedback_len = a.score, len(a.feedback)
+        try:
+            check(a)
+            a.checks[title]["status"] = check_status(a.feedback[feedback_len:])
+            a.checks[title]["penalty"] = score - a.score
+            return
+        except CheckTimeout:
+            reason = "timeout"
+        except AssessmentCancelled:
+            reason = "cancelled"
+        except CheckSkipped as e:
+            reason = str(e)
+        except Exception as e:
+            reason = f"error: {type(e).__name__}: {e}"
+            a.checks[title]["status"] = "error"
+            a.checks[title]["error"] = f"{type(e).__name__}: {e}"
+        # Drop whatever the interrupted check reported so far
+        a.score = score
+        del a.feedback[feedback_len:]
+        a.metrics.clear()
+    a.skipped.append(title)
+    a.feedback.append(f"○ {title} skipped ({reason})")
+
+def assess_laravel_project(project_path, cache=None, control=None, budget=None, progress=None,
+                           junit_reports=(), asset_budgets=None, scan_pool=None):
+    """Print the quality report for one project and return it as a dict.
+
+    progress, if given, is called as progress(done, total, title) before the
+    project scan and each check, from the thread running the assessment.
+    junit_reports are JUnit XML files relative to the project; by default
+    they are looked for there. asset_budgets overrides entries of
+    ASSET_BUDGETS. scan_pool is a process pool shared by several assessments.
+    """
+    path = Path(project_path).resolve()
+    if not path.exists():
+        print("❌ Project path does not exist!")
+        return
+
+    if not (path / "artisan").exists() or not (path / "composer.json").exists():
+        print("❌ This doesn't look like a Laravel project (missing artisan or composer.json)")
+        return
+
+    if control is None and budget is not None:
+        control = RunControl(budget, budget)
+    a = Assessment(path, cache, control, budget, junit_reports, asset_budgets, scan_pool)
+    steps = len(CHECKS) + 1
+    if progress is not None:
+        progress(0, steps, "Project scan")
+    scan_step(a)
+    for done, (title, check) in enumerate(CHECKS, 1):
+        if progress is not None:
+            progress(done, steps, title)
+        run_check(a, title, check)
+    if progress is not None:
+        progress(steps, steps, None)
 
     # Final score cap
-    score = max(0, min(100, score))
+    score = max(0, min(100, a.score))
 
     # Output
     print("\n🚀 Laravel Code Quality Report")
     print("=" * 50)
-    for line in feedback:
+    for line in a.feedback:
         print(line)
     print("=" * 50)
+    if a.scan["status"] == "ok":
+        print(f"🔎 Project scan: {a.scan['files']} file(s) in {a.scan['seconds']:.2f}s")
+    if a.strata is not None:
+        sampled = sum(len(s) for _, s in a.strata.values())
+        population = sum(len(m) for m, _ in a.strata.values())
+        print(f"🎲 Quick mode: sampled {sampled} of {population} files; ~ values are estimates ±95% CI")
+    if a.skipped:
+        print(f"⏱ Partial results: {len(a.skipped)} check(s) skipped")
     print(f"📊 Final Score: {score}/100")
 
     if score >= 90:
@@ -122,10 +1816,77 @@ def assess_laravel_project(project_path):
     else:
         print("⚠ Needs work – consider refactoring and adding tests!")
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python laravel_quality.py /path/to/laravel/project")
-        sys.exit(1)
+    return {
+        "project_path": str(path),
+        "timestamp": datetime.now().isoformat(),
+        "score": score,
+        "feedback": a.feedback,
+        "skipped": a.skipped,
+        "quick": a.strata is not None,
+        "checks": a.checks,
+        "scan": a.scan,
+        "assets": a.assets,
+    }
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "analyze":
+        try:
+            from laravel_quality_fleet import analyze_main
+        except ImportError as e:
+            print(f"❌ The analyze command needs NumPy ({e}); install it with: pip install numpy")
+            sys.exit(1)
+        return analyze_main(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Assess the code quality of Laravel projects.",
+        epilog="Run 'laravel_quality.py analyze --help' to rank saved results against the fleet.",
+    )
+    parser.add_argument("projects", nargs="+", metavar="PROJECT", help="path to a Laravel project")
+    parser.add_argument("--cache-dir", help="per-file analysis cache directory (default: ~/.cache/laravel_quality)")
+    parser.add_argument("--no-cache", action="store_true", help="analyse every file from scratch")
+    parser.add_argument("--timeout", type=float, default=RUN_TIMEOUT,
+                        help=f"seconds allowed per project, 0 for no limit (default: {RUN_TIMEOUT})")
+    parser.add_argument("--check-timeout", type=float, default=CHECK_TIMEOUT,
+                        help=f"seconds allowed per check, 0 for no limit (default: {CHECK_TIMEOUT})")
+    parser.add_argument("--budget", type=parse_duration, metavar="DURATION",
+                        help="quick mode: sample files and skip slow commands to finish within e.g. 2s")
+    parser.add_argument("--junit", action="append", default=[], metavar="FILE",
+                        help="JUnit XML report relative to the project, repeatable for sharded runs "
+                             "(default: found via phpunit.xml or in the usual places)")
+    parser.add_argument("--asset-budget", action="append", default=[], type=parse_asset_budget, metavar="NAME=KB",
+                        help="compressed size budget for frontend bundles, repeatable; NAME is entry, css, chunk "
+                             "or split (defaults: " + ", ".join(f"{k}={v}" for k, v in ASSET_BUDGETS.items()) + ")")
+    parser.add_argument("--json", metavar="FILE", help="write the results of this batch to a JSON file")
+    parser.add_argument("--history", metavar="FILE", help="append each result as a line to a JSON Lines history file")
+    parser.add_argument("--team", help="team name recorded with the results (used by analyze)")
+    args = parser.parse_args(argv)
 
-    project_path = sys.argv[1]
-    assess_laravel_project(project_path)
\ No newline at end of file
+    cache = None if args.no_cache else AnalysisCache(args.cache_dir)
+    results = []
+    for project_path in args.projects:
+        if args.budget is not None:
+            control = RunControl(args.budget, args.budget)
+        else:
+            control = RunControl(args.timeout, args.check_timeout)
+        result = assess_laravel_project(
+            project_path, cache, control, args.budget, junit_reports=args.junit, asset_budgets=dict(args.asset_budget)
+        )
+        if result is None:
+            continue
+        if args.team:
+            result["team"] = args.team
+        results.append(result)
+        if args.history:
+            with open(args.history, "a") as f:
+                f.write(json.dumps(result) + "\n")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if cache is not None and len(args.projects) > 1:
+        print(f"\n🗃 Analysis cache: {cache.hits} file(s) reused, {cache.misses} analysed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Content-addressed analysis cache for the Laravel Quality Assessor.
+Per-file analysis results are keyed by the BLAKE2 hash of the file contents,
+so byte-identical files are analysed once and shared across projects and runs.
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "laravel_quality"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_EVERY = 500          # writes between size checks
+LOCK_STALE_SECONDS = 60
+
+
+def content_key(data, namespace=""):
+    """Return the BLAKE2 content address of a file's bytes"""
+    digest = hashlib.blake2b(data, digest_size=20, person=namespace.encode()[:16])
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """On-disk store of JSON analysis results, LRU-evicted to a size cap.
+
+    Entries are written to a temp file and atomically renamed into place, so
+    several processes can read and fill the same cache directory at once.
+    Reads bump the entry's mtime, which eviction uses as its LRU clock.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(cache_dir or os.environ.get("LARAVEL_QUALITY_CACHE") or DEFAULT_CACHE_DIR)
+        self.entries_dir = self.root / f"v{CACHE_VERSION}"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+
+    def _entry_path(self, key):
+        return self.entries_dir / key[:2] / f"{key[2:]}.json"
+
+    def get(self, key):
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        entry = self._entry_path(key)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=entry.parent, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, separators=(",", ":"))
+            os.replace(tmp_name, entry)
+        except OSError:
+            # A read-only or full cache must never break an assessment
+            return
+        self._writes += 1
+        if self._writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def _acquire_evict_lock(self):
+        lock = self.root / ".evict.lock"
+        try:
+            if time.time() - lock.stat().st_mtime > LOCK_STALE_SECONDS:
+                lock.unlink()
+        except OSError:
+            pass
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError:
+            return None
+        os.close(fd)
+        return lock
+
+    def evict(self):
+        """Drop least recently used entries until the store fits its size cap"""
+        lock = self._acquire_evict_lock()
+        if lock is None:
+            return 0  # another process is already evicting
+        removed = 0
+        try:
+            entries = []
+            total = 0
+            for entry in self.entries_dir.glob("*/*.json"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry))
+                total += st.st_size
+            if total <= self.max_bytes:
+                return 0
+            target = self.max_bytes * 0.9
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= target:
+                    break
+                try:
+                    entry.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        finally:
+            try:
+                lock.unlink()
+            except OSError:
+                pass
+        return removed
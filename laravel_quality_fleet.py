@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Fleet analytics for the Laravel Quality Assessor.
+Loads saved results (--json batches, --history files or GUI JSON exports) into
+a projects x checks matrix and ranks every project against the whole fleet
+with vectorized NumPy aggregates, so thousands of projects stay interactive.
+"""
+
+import json
+import argparse
+import warnings
+from html import escape
+from datetime import datetime
+
+import numpy as np
+
+STATUSES = ("pass", "warn", "fail", "skipped")
+MISSING = -1
+PASS, WARN, FAIL, SKIPPED = range(len(STATUSES))
+PERCENTILES = (10, 50, 90)
+SHOW_PROJECTS = 15
+
+
+def load_results(paths):
+    """Read .json (one result or a list) and .jsonl files; keep the latest run per project"""
+    latest = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            if str(path).endswith(".jsonl"):
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                records = data if isinstance(data, list) else [data]
+        for record in records:
+            key = record.get("project_path", "?")
+            if key not in latest or record.get("timestamp", "") >= latest[key].get("timestamp", ""):
+                latest[key] = record
+    return list(latest.values())
+
+
+class FleetMatrix:
+    """Columnar view of fleet results: one row per project, one column per check.
+
+    status holds STATUSES indexes (MISSING where a result has no record for a
+    check, e.g. older exports, or the check errored), penalty the points each
+    check cost (NaN when missing, skipped or errored) and metrics the raw
+    numbers each check recorded.
+    """
+
+    def __init__(self, results, teams=None):
+        teams = teams or {}
+        self.projects = [r.get("project_path", "?") for r in results]
+        self.scores = np.array([r.get("score", 0) for r in results], dtype=np.float64)
+
+        checks = {}
+        metric_names = {}
+        for r in results:
+            for title, record in r.get("checks", {}).items():
+                checks.setdefault(title, len(checks))
+                for name in record.get("metrics", {}):
+                    metric_names.setdefault(f"{title}: {name}", len(metric_names))
+        self.checks = list(checks)
+        self.metric_names = list(metric_names)
+
+        # Fill plain lists and convert once; item assignment into arrays is
+        # an order of magnitude slower per cell
+        codes = {status: i for i, status in enumerate(STATUSES)}
+        status_rows, penalty_rows, metric_rows = [], [], []
+        for r in results:
+            status_row = [MISSING] * len(checks)
+            penalty_row = [np.nan] * len(checks)
+            metric_row = [np.nan] * len(metric_names)
+            for title, record in r.get("checks", {}).items():
+                j = checks[title]
+                status = record.get("status")
+                status_row[j] = codes.get(status, MISSING)
+                if status in ("pass", "warn", "fail"):
+                    penalty_row[j] = record.get("penalty", 0)
+                for name, value in record.get("metrics", {}).items():
+                    metric_row[metric_names[f"{title}: {name}"]] = value
+            status_rows.append(status_row)
+            penalty_rows.append(penalty_row)
+            metric_rows.append(metric_row)
+        shape = (len(results), len(checks))
+        self.status = np.array(status_rows, dtype=np.int8).reshape(shape)
+        self.penalty = np.array(penalty_rows, dtype=np.float32).reshape(shape)
+        self.metrics = np.array(metric_rows, dtype=np.float64).reshape(len(results), len(metric_names))
+
+        labels = [
+            teams.get(project) or teams.get(project.rstrip("/").rsplit("/", 1)[-1]) or r.get("team") or "unassigned"
+            for project, r in zip(self.projects, results)
+        ]
+        self.team_names, self.team_index = np.unique(np.array(labels, dtype=str), return_inverse=True)
+
+    def __len__(self):
+        return len(self.projects)
+
+    def score_percentiles(self):
+        """Percentile rank of every project's score within the fleet (ties share the mid rank)"""
+        ordered = np.sort(self.scores)
+        below = np.searchsorted(ordered, self.scores, side="left")
+        at_or_below = np.searchsorted(ordered, self.scores, side="right")
+        return (below + at_or_below) / 2 / max(len(self), 1) * 100
+
+    def penalty_percentiles(self):
+        """Per-check percentile of each project's penalty (100 = costliest, ties share the mid rank)"""
+        # NaNs sort last, so the first `count` values of each column are real penalties
+        ordered = np.sort(self.penalty, axis=0)
+        pct = np.full(self.penalty.shape, np.nan)
+        for j, count in enumerate((~np.isnan(self.penalty)).sum(axis=0)):
+            column = self.penalty[:, j]
+            assessed = ~np.isnan(column)
+            below = np.searchsorted(ordered[:count, j], column[assessed], side="left")
+            at_or_below = np.searchsorted(ordered[:count, j], column[assessed], side="right")
+            pct[assessed, j] = (below + at_or_below) / 2 / max(count, 1) * 100
+        return pct
+
+    def check_summary(self):
+        """Pass/warn/fail rates, penalty percentiles and score correlation per check"""
+        assessed = (self.status >= 0) & (self.status != SKIPPED)
+        counts = assessed.sum(axis=0)
+        failing = (self.status == FAIL).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = {
+                status: (self.status == code).sum(axis=0) / counts
+                for code, status in enumerate(STATUSES[:SKIPPED])
+            }
+            # Point-biserial correlation of "this check fails" with the overall score
+            failing_c = failing - failing.mean(axis=0)
+            scores_c = self.scores - self.scores.mean()
+            corr = (failing_c * scores_c[:, None]).sum(axis=0) / np.sqrt(
+                (failing_c ** 2).sum(axis=0) * (scores_c ** 2).sum()
+            )
+            n_failing = failing.sum(axis=0)
+            mean_failing = (failing * self.scores[:, None]).sum(axis=0) / n_failing
+            mean_other = ((1 - failing) * self.scores[:, None]).sum(axis=0) / (len(self) - n_failing)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+            p50, p90 = np.nanpercentile(self.penalty, (50, 90), axis=0)
+
+        return [
+            {
+                "check": title,
+                "assessed": int(counts[j]),
+                "pass": rates["pass"][j],
+                "warn": rates["warn"][j],
+                "fail": rates["fail"][j],
+                "penalty_p50": p50[j],
+                "penalty_p90": p90[j],
+                "score_corr": corr[j],
+                "mean_score_failing": mean_failing[j],
+                "mean_score_other": mean_other[j],
+            }
+            for j, title in enumerate(self.checks)
+        ]
+
+    def metric_summary(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            quantiles = np.nanpercentile(self.metrics, PERCENTILES, axis=0)
+            means = np.nanmean(self.metrics, axis=0)
+        return [
+            {"metric": name, "mean": means[k], **{f"p{q}": quantiles[n, k] for n, q in enumerate(PERCENTILES)}}
+            for k, name in enumerate(self.metric_names)
+        ]
+
+    def team_summary(self):
+        """Score distribution and fail rate per team"""
+        sizes = np.bincount(self.team_index, minlength=len(self.team_names))
+        means = np.bincount(self.team_index, weights=self.scores, minlength=len(self.team_names)) / sizes
+        fails = np.bincount(
+            self.team_index, weights=(self.status == FAIL).sum(axis=1), minlength=len(self.team_names)
+        ) / sizes
+        rows = []
+        for t, team in enumerate(self.team_names):
+            p10, p50, p90 = np.percentile(self.scores[self.team_index == t], PERCENTILES)
+            rows.append({
+                "team": str(team), "projects": int(sizes[t]), "mean": means[t],
+                "p10": p10, "median": p50, "p90": p90, "fails_per_project": fails[t],
+            })
+        rows.sort(key=lambda row: row["mean"])
+        return rows
+
+    def rankings(self):
+        """Projects ordered by score, each with the checks where it trails the fleet most"""
+        score_pct = self.score_percentiles()
+        penalty_pct = self.penalty_percentiles()
+        # Only costly checks count as weak spots
+        weakness = np.where(self.penalty > 0, penalty_pct, -1)
+        worst = np.argsort(-weakness, axis=1)[:, :3]
+        rows = []
+        for i in np.argsort(self.scores, kind="stable"):
+            rows.append({
+                "project": self.projects[i],
+                "team": str(self.team_names[self.team_index[i]]),
+                "score": self.scores[i],
+                "percentile": score_pct[i],
+                "weak_spots": [self.checks[j] for j in worst[i] if weakness[i, j] >= 0],
+            })
+        return rows
+
+
+def fmt(value, pattern="{:.0f}"):
+    return "–" if value is None or np.isnan(value) else pattern.format(value)
+
+
+def print_summary(fleet):
+    scores = fleet.scores
+    p10, p50, p90 = np.percentile(scores, PERCENTILES)
+    print(f"🚚 Fleet of {len(fleet)} project(s), {len(fleet.checks)} check(s), {len(fleet.team_names)} team(s)\n")
+    print(f"📊 Score: mean {scores.mean():.1f}, p10 {p10:.0f}, median {p50:.0f}, p90 {p90:.0f}")
+
+    if fleet.checks:
+        print("\n🔍 Checks most associated with low scores:")
+        summary = sorted(fleet.check_summary(), key=lambda c: (np.nan_to_num(c["score_corr"], nan=1), -c["fail"]))
+        for c in summary:
+            print(f"   {c['check']}: fail {fmt(c['fail'] * 100)}%, warn {fmt(c['warn'] * 100)}%, "
+                  f"penalty p90 {fmt(c['penalty_p90'])}, corr with score {fmt(c['score_corr'], '{:+.2f}')}")
+
+    print("\n👥 Teams:")
+    for t in fleet.team_summary():
+        print(f"   {t['team']}: {t['projects']} project(s), mean {t['mean']:.1f}, "
+              f"p10 {t['p10']:.0f}, median {t['median']:.0f}, p90 {t['p90']:.0f}")
+
+    print("\n⚠ Lowest ranked projects:")
+    for row in fleet.rankings()[:SHOW_PROJECTS]:
+        spots = f" – weakest: {', '.join(row['weak_spots'])}" if row["weak_spots"] else ""
+        print(f"   {row['score']:.0f}/100 (p{row['percentile']:.0f}) {row['project']}{spots}")
+
+
+def score_color(score):
+    if score >= 90:
+        return "green"
+    elif score >= 75:
+        return "orange"
+    elif score >= 60:
+        return "yellow"
+    return "red"
+
+
+def generate_fleet_html(fleet):
+    """Fleet summary in the same layout as the GUI's HTML report"""
+    mean = fleet.scores.mean()
+    counts, edges = np.histogram(fleet.scores, bins=10, range=(0, 100))
+    tallest = max(counts.max(), 1)
+    histogram = "".join(
+        f'<div class="bar-row"><span class="bar-label">{edges[k]:.0f}–{edges[k + 1]:.0f}</span>'
+        f'<div class="progress-bar"><div class="progress-fill" style="width: {counts[k] / tallest * 100:.0f}%; '
+        f'background: {score_color(edges[k])}"></div></div><span class="bar-label">{counts[k]}</span></div>'
+        for k in range(len(counts))
+    )
+
+    def table(headers, rows):
+        head = "".join(f"<th>{escape(h)}</th>" for h in headers)
+        body = "".join("<tr>" + "".join(f"<td>{escape(str(cell))}</td>" for cell in row) + "</tr>" for row in rows)
+        return f"<table><tr>{head}</tr>{body}</table>"
+
+    checks = sorted(fleet.check_summary(), key=lambda c: (np.nan_to_num(c["score_corr"], nan=1), -c["fail"]))
+    checks_table = table(
+        ("Check", "Assessed", "Pass", "Warn", "Fail", "Penalty p50", "Penalty p90", "Corr. with score",
+         "Mean score (failing / other)"),
+        [(c["check"], c["assessed"], fmt(c["pass"] * 100, "{:.0f}%"), fmt(c["warn"] * 100, "{:.0f}%"),
+          fmt(c["fail"] * 100, "{:.0f}%"), fmt(c["penalty_p50"]), fmt(c["penalty_p90"]),
+          fmt(c["score_corr"], "{:+.2f}"),
+          f"{fmt(c['mean_score_failing'], '{:.1f}')} / {fmt(c['mean_score_other'], '{:.1f}')}")
+         for c in checks],
+    )
+    teams_table = table(
+        ("Team", "Projects", "Mean", "p10", "Median", "p90", "Failed checks / project"),
+        [(t["team"], t["projects"], f"{t['mean']:.1f}", f"{t['p10']:.0f}", f"{t['median']:.0f}",
+          f"{t['p90']:.0f}", f"{t['fails_per_project']:.1f}") for t in fleet.team_summary()],
+    )
+    metrics_table = table(
+        ("Metric", "Mean", "p10", "p50", "p90"),
+        [(m["metric"], fmt(m["mean"], "{:.1f}"), fmt(m["p10"]), fmt(m["p50"]), fmt(m["p90"]))
+         for m in fleet.metric_summary()],
+    )
+    rankings = fleet.rankings()
+    project_rows = lambda rows: [
+        (r["project"], r["team"], f"{r['score']:.0f}", f"p{r['percentile']:.0f}", ", ".join(r["weak_spots"]) or "–")
+        for r in rows
+    ]
+    project_headers = ("Project", "Team", "Score", "Percentile", "Weakest checks vs fleet")
+
+    return f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Laravel Quality Fleet Report</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background: #1a1a1a; color: #fff; }}
+        .container {{ max-width: 1100px; margin: 0 auto; }}
+        .header {{ text-align: center; margin-bottom: 30px; }}
+        .score-card {{ background: #2d2d2d; border-radius: 10px; padding: 30px; margin-bottom: 20px; text-align: center; }}
+        .score {{ font-size: 48px; font-weight: bold; color: {score_color(mean)}; }}
+        .status {{ font-size: 18px; margin-top: 10px; }}
+        .feedback {{ background: #2d2d2d; border-radius: 10px; padding: 20px; margin-bottom: 20px; overflow-x: auto; }}
+        .progress-bar {{ width: 100%; height: 20px; background: #3d3d3d; border-radius: 10px; overflow: hidden; margin: 6px 10px; }}
+        .progress-fill {{ height: 100%; transition: width 0.3s ease; }}
+        .bar-row {{ display: flex; align-items: center; }}
+        .bar-label {{ min-width: 60px; color: #ccc; font-size: 14px; }}
+        table {{ width: 100%; border-collapse: collapse; font-size: 14px; }}
+        th, td {{ text-align: left; padding: 6px 10px; border-bottom: 1px solid #3d3d3d; }}
+        th {{ color: #aaa; font-weight: normal; }}
+        .meta {{ color: #888; font-size: 14px; text-align: center; margin-top: 20px; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🚚 Laravel Quality Fleet Report</h1>
+            <div class="meta">
+                {len(fleet)} project(s), {len(fleet.team_names)} team(s)<br>
+                Generated: {datetime.now().isoformat()}
+            </div>
+        </div>
+
+        <div class="score-card">
+            <div class="score">{mean:.1f}/100</div>
+            <div class="status">Fleet average – median {np.median(fleet.scores):.0f}, p10 {np.percentile(fleet.scores, 10):.0f}, p90 {np.percentile(fleet.scores, 90):.0f}</div>
+            {histogram}
+        </div>
+
+        <div class="feedback">
+            <h3>🔍 Checks (most associated with low scores first)</h3>
+            {checks_table}
+        </div>
+
+        <div class="feedback">
+            <h3>👥 Teams</h3>
+            {teams_table}
+        </div>
+
+        <div class="feedback">
+            <h3>⚠ Lowest ranked projects</h3>
+            {table(project_headers, project_rows(rankings[:SHOW_PROJECTS]))}
+        </div>
+
+        <div class="feedback">
+            <h3>🌟 Highest ranked projects</h3>
+            {table(project_headers, project_rows(rankings[::-1][:SHOW_PROJECTS]))}
+        </div>
+
+        <div class="feedback">
+            <h3>📏 Metrics</h3>
+            {metrics_table}
+        </div>
+
+        <div class="meta">
+            Generated by Laravel Quality Assessor
+        </div>
+    </div>
+</body>
+</html>
+    """
+
+
+def analyze_main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="laravel_quality.py analyze",
+        description="Rank saved assessment results against the whole fleet.",
+    )
+    parser.add_argument("results", nargs="+",
+                        help="result files: --json batches, --history .jsonl files or GUI JSON exports")
+    parser.add_argument("--teams", metavar="FILE",
+                        help="JSON object mapping project paths (or directory names) to team names")
+    parser.add_argument("--output", "-o", default="fleet_report.html", help="HTML report path")
+    args = parser.parse_args(argv)
+
+    teams = None
+    if args.teams:
+        with open(args.teams, "r", encoding="utf-8") as f:
+            teams = json.load(f)
+
+    results = load_results(args.results)
+    if not results:
+        print("❌ No assessment results found.")
+        return
+    fleet = FleetMatrix(results, teams)
+    print_summary(fleet)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(generate_fleet_html(fleet))
+    print(f"\n📄 Fleet report written to {args.output}")
@@ -5,6 +5,7 @@ A modern graphical interface for the Laravel project quality assessment tool.
 """
 
 import customtkinter as ctk
+import io
 import threading
 import os
 import sys
@@ -13,29 +14,82 @@ import subprocess
 from pathlib import Path
 import webbrowser
 from datetime import datetime
+from contextlib import contextmanager
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from tkinter import filedialog, messagebox
 
 # Import the original assessment logic
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from laravel_quality import assess_laravel_project
+from laravel_quality import assess_laravel_project, RunControl, CHECKS
+from laravel_quality_cache import AnalysisCache
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Time budget in seconds for the quick first pass before the full run
+QUICK_BUDGET = 2
+# Assessments that run at once; further projects wait in the queue
+MAX_CONCURRENT_ASSESSMENTS = max(1, min(3, os.cpu_count() or 1))
+WELCOME_TAB = "🏠 Welcome"
+COMPARE_TAB = "📊 Compare"
+
+class ThreadOutput:
+    """sys.stdout stand-in that sends print() from a capturing thread to its own buffer.
+    
+    redirect_stdout swaps the stream for the whole process, which would mix
+    the reports of assessments running side by side.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        if self.stream is None:  # pythonw has no console
+            return len(text)
+        return self.stream.write(text)
+        
+    def flush(self):
+        if getattr(self.local, "buffer", None) is None and self.stream is not None:
+            self.stream.flush()
+            
+    @contextmanager
+    def capture(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+
 class LaravelQualityGUI:
     def __init__(self):
         self.root = ctk.CTk()
         self.root.title("Laravel Quality Assessor")
-        self.root.geometry("900x700")
+        self.root.geometry("1000x750")
         self.root.resizable(True, True)
         
         # Configure grid
         self.root.grid_columnconfigure(0, weight=1)
-        self.root.grid_rowconfigure(2, weight=1)
+        self.root.grid_rowconfigure(3, weight=1)
         
+        self.tabs = {}
+        self.compare_frame = None
+        self.closing = False
+        self.analysis_cache = AnalysisCache()
+        # One bounded pool shared by every tab; the Tk main loop never runs engine code
+        self.pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ASSESSMENTS, thread_name_prefix="assessment")
+        # and one process pool their project scans share. Spawned, not forked:
+        # forking a process that runs Tk and worker threads is unsafe
+        self.scan_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        self.output = ThreadOutput(sys.stdout)
+        sys.stdout = self.output
         self.setup_ui()
-        self.assessment_results = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def setup_ui(self):
         # Header
@@ -44,8 +98,8 @@ class LaravelQualityGUI:
         header_frame.grid_propagate(False)
         
         title_label = ctk.CTkLabel(
-            header_frame, 
-            text="🚀 Laravel Quality Assessor", 
+            header_frame,
+            text="🚀 Laravel Quality Assessor",
             font=ctk.CTkFont(size=28, weight="bold")
         )
         title_label.pack(pady=20)
@@ -60,8 +114,8 @@ class LaravelQualityGUI:
         
         self.path_var = ctk.StringVar()
         self.path_entry = ctk.CTkEntry(
-            selection_frame, 
-            textvariable=self.path_var, 
+            selection_frame,
+            textvariable=self.path_var,
             placeholder_text="Select your Laravel project directory...",
             height=40,
             font=ctk.CTkFont(size=12)
@@ -75,12 +129,20 @@ class LaravelQualityGUI:
             width=100,
             height=40
         )
-        browse_button.grid(row=0, column=2, sticky="e", padx=(10, 20), pady=20)
+        browse_button.grid(row=0, column=2, sticky="e", padx=(10, 10), pady=20)
         
-        # Control buttons frame
+        self.quick_var = ctk.BooleanVar(value=False)
+        quick_checkbox = ctk.CTkCheckBox(
+            selection_frame,
+            text=f"⚡ Quick first ({QUICK_BUDGET}s)",
+            variable=self.quick_var
+        )
+        quick_checkbox.grid(row=0, column=3, sticky="e", padx=(10, 20), pady=20)
+        
+        # Control buttons frame; everything but Assess acts on the selected tab
         control_frame = ctk.CTkFrame(self.root)
         control_frame.grid(row=2, column=0, sticky="ew", padx=20, pady=10)
-        control_frame.grid_columnconfigure((0, 1, 2, 3, 4), weight=1)
+        control_frame.grid_columnconfigure((0, 1, 2, 3, 4, 5), weight=1)
         
         self.assess_button = ctk.CTkButton(
             control_frame,
@@ -109,13 +171,23 @@ class LaravelQualityGUI:
         )
         self.export_button.grid(row=0, column=2, sticky="ew", padx=10, pady=20)
         
-        self.clear_button = ctk.CTkButton(
+        self.compare_button = ctk.CTkButton(
             control_frame,
-            text="🗑️ Clear Results",
-            command=self.clear_results,
-            height=50
+            text="📊 Compare",
+            command=self.show_comparison,
+            height=50,
+            state="disabled"
+        )
+        self.compare_button.grid(row=0, column=3, sticky="ew", padx=10, pady=20)
+        
+        self.close_button = ctk.CTkButton(
+            control_frame,
+            text="✖ Close Tab",
+            command=self.close_tab,
+            height=50,
+            state="disabled"
         )
-        self.clear_button.grid(row=0, column=3, sticky="ew", padx=10, pady=20)
+        self.close_button.grid(row=0, column=4, sticky="ew", padx=10, pady=20)
         
         self.about_button = ctk.CTkButton(
             control_frame,
@@ -123,32 +195,19 @@ class LaravelQualityGUI:
             command=self.show_about,
             height=50
         )
-        self.about_button.grid(row=0, column=4, sticky="ew", padx=10, pady=20)
+        self.about_button.grid(row=0, column=5, sticky="ew", padx=10, pady=20)
         
-        # Suggestions toggle variable
-        self.show_suggestions = False
-        
-        # Results frame with scrollable content
-        self.results_frame = ctk.CTkScrollableFrame(self.root, label_text="Assessment Results")
-        self.results_frame.grid(row=3, column=0, sticky="nsew", padx=20, pady=10)
-        self.results_frame.grid_columnconfigure(0, weight=1)
-        
-        # Suggestions frame (hidden by default)
-        self.suggestions_frame = ctk.CTkScrollableFrame(self.root, label_text="💡 Improvement Suggestions")
-        self.suggestions_frame.grid(row=4, column=0, sticky="nsew", padx=20, pady=(0, 20))
-        self.suggestions_frame.grid_columnconfigure(0, weight=1)
-        self.suggestions_frame.grid_remove()  # Hide initially
-        
-        # Progress bar
-        self.progress_bar = ctk.CTkProgressBar(self.root, mode="indeterminate")
-        self.progress_bar.grid(row=5, column=0, sticky="ew", padx=20, pady=(0, 20))
-        self.progress_bar.set(0)
+        # One tab per project, plus the welcome and comparison tabs
+        self.tabview = ctk.CTkTabview(self.root, command=self.refresh_controls)
+        self.tabview.grid(row=3, column=0, sticky="nsew", padx=20, pady=(0, 20))
         
         # Initial message
         self.show_initial_message()
         
     def show_initial_message(self):
-        welcome_frame = ctk.CTkFrame(self.results_frame)
+        welcome_tab = self.tabview.add(WELCOME_TAB)
+        welcome_tab.grid_columnconfigure(0, weight=1)
+        welcome_frame = ctk.CTkFrame(welcome_tab)
         welcome_frame.grid(row=0, column=0, sticky="ew", pady=10)
         welcome_frame.grid_columnconfigure(0, weight=1)
         
@@ -161,7 +220,7 @@ class LaravelQualityGUI:
         
         instructions = ctk.CTkLabel(
             welcome_frame,
-            text="1. Select your Laravel project directory using the Browse button\n2. Click 'Assess Quality' to start the analysis\n3. View detailed results and export reports\n\nThis tool will check your Laravel project for:\n• Environment configuration security\n• Code style and formatting tools\n• Test coverage and quality\n• Controller complexity\n• Form Requests usage\n• Migration health\n• Dependencies status\n• Modern Laravel patterns",
+            text=f"1. Select your Laravel project directory using the Browse button\n2. Click 'Assess Quality' to start the analysis in a new tab\n3. Repeat for other projects – up to {MAX_CONCURRENT_ASSESSMENTS} run at once, the rest wait in the queue\n4. View detailed results, compare projects and export reports\n\nThis tool will check your Laravel project for:\n• Environment configuration security\n• Code style and formatting tools\n• Test coverage and quality\n• Slow tests from JUnit reports\n• Controller complexity\n• Form Requests usage\n• Migration health\n• Dependencies status\n• Blade view performance\n• Frontend bundle weight\n• Unbounded Eloquent queries\n• Blocking work in HTTP handlers\n• Production optimization readiness\n• Modern Laravel patterns",
             font=ctk.CTkFont(size=12),
             justify="left"
         )
@@ -178,7 +237,7 @@ class LaravelQualityGUI:
             path = Path(directory)
             if not (path / "artisan").exists() or not (path / "composer.json").exists():
                 self.show_warning("⚠️ This doesn't appear to be a Laravel project.\nMake sure it has 'artisan' and 'composer.json' files.")
-    
+                
     def start_assessment(self):
         project_path = self.path_var.get().strip()
         if not project_path:
@@ -194,51 +253,94 @@ class LaravelQualityGUI:
         if not (path / "artisan").exists() or not (path / "composer.json").exists():
             messagebox.showerror("Invalid Project", "This doesn't appear to be a Laravel project.\nMake sure it has 'artisan' and 'composer.json' files.")
             return
+            
+        # Re-run in the project's existing tab, or open a new one
+        project_path = str(path.resolve())
+        tab = next((t for t in self.tabs.values() if t.project_path == project_path), None)
+        if tab is None:
+            name = path.resolve().name or project_path
+            unique = name
+            n = 2
+            while unique in self.tabs or unique in (WELCOME_TAB, COMPARE_TAB):
+                unique = f"{name} ({n})"
+                n += 1
+            tab = ProjectTab(self, unique, project_path)
+            self.tabs[unique] = tab
+        self.tabview.set(tab.name)
+        if not tab.running:
+            tab.start(QUICK_BUDGET if self.quick_var.get() else None)
+        self.refresh_controls()
         
-        # Clear previous results
-        self.clear_results()
-        
-        # Disable assess button and start progress
-        self.assess_button.configure(state="disabled", text="🔄 Analyzing...")
-        self.progress_bar.start()
+    def current_tab(self):
+        return self.tabs.get(self.tabview.get())
         
-        # Run assessment in separate thread
-        thread = threading.Thread(target=self.run_assessment, args=(project_path,))
-        thread.daemon = True
-        thread.start()
+    def refresh_controls(self):
+        """Point the control buttons at the selected tab"""
+        tab = self.current_tab()
+        has_results = bool(tab and tab.assessment_results)
+        self.suggestions_button.configure(
+            state="normal" if has_results else "disabled",
+            text="💡 Hide Suggestions" if tab and tab.show_suggestions else "💡 Suggestions"
+        )
+        self.export_button.configure(state="normal" if has_results else "disabled")
+        self.close_button.configure(state="normal" if tab or self.tabview.get() == COMPARE_TAB else "disabled")
+        finished = [t for t in self.tabs.values() if t.assessment_results]
+        self.compare_button.configure(state="normal" if len(finished) >= 2 else "disabled")
         
-    def run_assessment(self, project_path):
+    def post(self, callback, *args):
+        """Run callback on the Tk main loop; safe to call from worker threads"""
+        if self.closing:
+            return
         try:
-            # Capture the output of the assessment
-            import io
-            from contextlib import redirect_stdout
-            
-            output_buffer = io.StringIO()
-            
-            with redirect_stdout(output_buffer):
-                assess_laravel_project(project_path)
+            self.root.after(0, callback, *args)
+        except RuntimeError:
+            pass  # main loop already gone
             
-            results_text = output_buffer.getvalue()
-            self.assessment_results = self.parse_results(results_text)
-            
-            # Schedule UI update in main thread
-            self.root.after(0, self.display_results, results_text)
-            
-        except Exception as e:
-            error_msg = f"An error occurred during assessment: {str(e)}"
-            self.root.after(0, self.show_error, error_msg)
-        finally:
-            # Re-enable button and stop progress
-            self.root.after(0, self.assessment_finished)
+    def close_tab(self):
+        name = self.tabview.get()
+        if name == COMPARE_TAB:
+            self.tabview.delete(COMPARE_TAB)
+            self.compare_frame = None
+        elif name in self.tabs:
+            tab = self.tabs.pop(name)
+            tab.close()
+            self.tabview.delete(name)
+            self.refresh_comparison()
+        self.refresh_controls()
+        
+    def on_close(self):
+        self.closing = True
+        for tab in self.tabs.values():
+            tab.close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.scan_pool.shutdown(wait=False, cancel_futures=True)
+        sys.stdout = self.output.stream
+        self.root.destroy()
+        
+    def capture_assessment(self, project_path, run_control, budget=None, progress=None):
+        # Capture the output of the assessment running on this worker thread
+        with self.output.capture() as output_buffer:
+            result = assess_laravel_project(
+                project_path, self.analysis_cache, run_control, budget, progress, scan_pool=self.scan_pool
+            )
             
-    def parse_results(self, results_text):
+        return output_buffer.getvalue(), result
+        
+    def parse_results(self, results_text, result=None, project_path=None):
         """Parse the assessment results into structured data"""
         results = {
             "score": 0,
             "feedback": [],
             "suggestions": [],
             "timestamp": datetime.now().isoformat(),
-            "project_path": self.path_var.get()
+            "project_path": project_path or self.path_var.get(),
+            "skipped": list(result["skipped"]) if result else [],
+            "details": {},
+            "quick": "🎲 Quick mode:" in results_text,
+            # Per-check records, so exported JSON can be fed to the analyze command
+            "checks": result["checks"] if result else {},
+            # Bundle sizes from the build manifest, for the HTML report
+            "assets": result.get("assets") if result else None
         }
         
         lines = results_text.split('\n')
@@ -252,15 +354,21 @@ class LaravelQualityGUI:
                     pass
             elif line and (line.startswith("✓") or line.startswith("✗") or line.startswith("⚠") or line.startswith("○")):
                 results["feedback"].append(line)
+                if not result and line.startswith("○") and line.endswith(("skipped (timeout)", "skipped (cancelled)", "skipped (quick mode)")):
+                    results["skipped"].append(line[1:].rsplit(" skipped", 1)[0].strip())
+            elif line.startswith("↳") and results["feedback"]:
+                # Per-finding detail lines belong to the feedback line above them
+                results["details"].setdefault(results["feedback"][-1], []).append(line[1:].strip())
                 
         # Generate suggestions based on feedback
-        results["suggestions"] = self.generate_suggestions(results["feedback"], results["score"])
-                
+        results["suggestions"] = self.generate_suggestions(results["feedback"], results["score"], results["details"])
+        
         return results
         
-    def generate_suggestions(self, feedback, score):
+    def generate_suggestions(self, feedback, score, details=None):
         """Generate actionable suggestions based on assessment feedback"""
         suggestions = []
+        details = details or {}
         
         for item in feedback:
             if "Missing .env.example" in item:
@@ -291,6 +399,31 @@ class LaravelQualityGUI:
                     "impact": "Prevents security breaches and credential leaks"
                 })
                 
+            elif "env() call(s) outside config/" in item:
+                suggestions.append({
+                    "priority": "High",
+                    "title": "Read environment values through config()",
+                    "description": "env() returns null once the configuration is cached, so code calling it outside config/ forces you to run without config:cache.",
+                    "steps": [
+                        "Add each variable to a config file, e.g. 'stripe_key' => env('STRIPE_KEY') in config/services.php",
+                        "Replace env('STRIPE_KEY') in the listed files with config('services.stripe_key')",
+                        "Run php artisan config:cache and check the application still boots"
+                    ],
+                    "impact": "Enables config caching and faster request bootstrap"
+                })
+                
+            elif "missing from .env.example" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Document all environment variables",
+                    "description": "Some variables read with env() are not listed in .env.example, so new environments silently miss them.",
+                    "steps": [
+                        "Add the listed variables to .env.example with placeholder values",
+                        "Give optional variables a default in their config file"
+                    ],
+                    "impact": "Predictable setup for new developers and deployments"
+                })
+                
             elif "No code style fixer" in item:
                 suggestions.append({
                     "priority": "High",
@@ -336,6 +469,108 @@ class LaravelQualityGUI:
                     "impact": "Better catches bugs and reduces production issues"
                 })
                 
+            elif "tests took" in item and "budget" in item:
+                suggestions.append({
+                    "priority": "High",
+                    "title": "Speed up the test suite",
+                    "description": "A slow suite delays every pull request and tempts developers to skip running tests locally.",
+                    "steps": [
+                        "Run tests in parallel with php artisan test --parallel (or Pest --parallel)",
+                        "Use an in-memory SQLite database or LazilyRefreshDatabase for Feature tests",
+                        "Move logic that needs no HTTP or database into fast Unit tests",
+                        "Fake mail, queues, HTTP and storage with Mail::fake(), Queue::fake() and Http::fake()",
+                        "Split the suite across CI jobs and pass each shard's report with --junit"
+                    ],
+                    "impact": "Shorter CI runs and faster feedback on every change"
+                })
+                
+            elif "slower than" in item and "test(s)" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Fix the slowest tests",
+                    "description": "A handful of slow tests usually account for most of the suite's time.",
+                    "steps": [
+                        f"Profile {test}" for test in details.get(item, [])
+                    ] + [
+                        "Look for real HTTP calls, sleep(), large factories and repeated migrations",
+                        "Create only the records each test needs",
+                        "Run php artisan test --profile to list the slowest tests locally"
+                    ],
+                    "impact": "A faster suite without losing coverage"
+                })
+                
+            elif "write to the database without" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Reset the database between tests",
+                    "description": "Tests that write to the database without resetting it leave rows behind. Later tests then depend on the order the suite runs in.",
+                    "steps": [
+                        f"Add use RefreshDatabase; to {rel}" for rel in details.get(item, [])
+                    ] + [
+                        "Or apply it once: uses(RefreshDatabase::class)->in('Feature') in tests/Pest.php",
+                        "Use DatabaseTransactions when the schema is migrated once before the suite"
+                    ],
+                    "impact": "Independent tests that pass in any order and in parallel"
+                })
+                
+            elif "entry bundle(s) over budget" in item:
+                suggestions.append({
+                    "priority": "High" if item.startswith("✗") else "Medium",
+                    "title": "Shrink frontend bundles",
+                    "description": "Every kilobyte of JavaScript loaded up front has to be downloaded, parsed and executed before the page becomes interactive.",
+                    "steps": [
+                        f"Trim {finding}" for finding in details.get(item, [])
+                    ] + [
+                        "Run npx vite-bundle-visualizer (or webpack-bundle-analyzer for Mix) to see what is inside each chunk",
+                        "Replace heavy libraries with lighter ones or import only the functions you use",
+                        "Load page components lazily with import() or import.meta.glob",
+                        "Purge unused CSS with Tailwind's content paths"
+                    ],
+                    "impact": "Faster page loads, especially on mobile connections"
+                })
+                
+            elif "JS chunk(s) over the" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Break up large chunks",
+                    "description": "A single large chunk has to be downloaded in full before any of its code can run, and any change to it invalidates the whole file in browser caches.",
+                    "steps": [
+                        f"Split {finding}" for finding in details.get(item, [])
+                    ] + [
+                        "Group rarely changing libraries into their own chunks with manualChunks",
+                        "Move code used on a few pages behind dynamic import()"
+                    ],
+                    "impact": "Smaller downloads and better cache hit rates after deploys"
+                })
+                
+            elif "shipped more than once" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Deduplicate vendor chunks",
+                    "description": "The same vendor code is downloaded several times when it ends up in more than one chunk or entry.",
+                    "steps": [
+                        f"Merge {files}" for files in details.get(item, [])
+                    ] + [
+                        "Build every entry in one vite build (list them all in laravel({ input: [...] }))",
+                        "Put shared libraries in one chunk with build.rollupOptions.output.manualChunks",
+                        "With Laravel Mix, call mix.extract() to split vendor code out of each entry"
+                    ],
+                    "impact": "Smaller downloads and better browser caching of vendor code"
+                })
+                
+            elif "No code splitting" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Split code by page",
+                    "description": "Without lazily loaded chunks, every visitor downloads the JavaScript for every page on the first visit.",
+                    "steps": [
+                        "Resolve Inertia pages with resolvePageComponent(..., import.meta.glob('./Pages/**/*.vue'))",
+                        "Load rarely used widgets (editors, charts, maps) with dynamic import()",
+                        "Keep a separate entry for admin areas so regular visitors never load them"
+                    ],
+                    "impact": "A smaller first load that grows only with the pages a visitor opens"
+                })
+                
             elif "large controller" in item:
                 suggestions.append({
                     "priority": "Medium",
@@ -381,6 +616,119 @@ class LaravelQualityGUI:
                     "impact": "Consistent database schema across environments"
                 })
                 
+            elif "query call(s) in Blade views" in item:
+                suggestions.append({
+                    "priority": "High",
+                    "title": "Move queries out of Blade views",
+                    "description": "Queries issued from templates run on every render, are invisible to controllers and are a common cause of slow pages.",
+                    "steps": [
+                        "Check the listed views for ::where(), ::all() and ->get() calls",
+                        "Load the data in the controller and pass it to the view",
+                        "Use View Composers for data shared by layouts and partials",
+                        "Cache data that rarely changes (menus, categories)"
+                    ],
+                    "impact": "Fewer queries per request and faster page rendering"
+                })
+                
+            elif "loop(s) over relationships in views" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Eager load relationships used in views",
+                    "description": "Looping over a relationship inside a view lazily loads it once per parent record (N+1 queries).",
+                    "steps": [
+                        "Find the @foreach loops over $model->relation in the listed views",
+                        "Eager load the relationship in the controller: Post::with('comments')",
+                        "Enable Model::preventLazyLoading() in development to catch new cases"
+                    ],
+                    "impact": "Constant query count regardless of the number of records"
+                })
+                
+            elif "exceed include depth" in item:
+                suggestions.append({
+                    "priority": "Low",
+                    "title": "Flatten deep @include chains",
+                    "description": "Deeply nested or very wide include trees make views slow to compile and hard to follow.",
+                    "steps": [
+                        "Review the views with the deepest include chains",
+                        "Merge tiny partials back into their parents",
+                        "Use Blade components for reusable UI pieces"
+                    ],
+                    "impact": "Faster view rendering and simpler templates"
+                })
+                
+            elif "unbounded Eloquent read(s)" in item:
+                suggestions.append({
+                    "priority": "High" if item.startswith("✗") else "Medium",
+                    "title": "Bound queries that load whole tables",
+                    "description": "Model::all() and ->get() load every matching row into memory at once. On large tables this exhausts memory in exports, loops and scheduled commands.",
+                    "steps": [
+                        finding.replace(' → ', ': use ') for finding in details.get(item, [])
+                    ] + [
+                        "Use ->paginate() for lists returned to users",
+                        "Use ->lazy() or ->cursor() when iterating over every row (exports, loops)",
+                        "Use ->chunkById(1000, ...) in jobs and scheduled commands that update rows"
+                    ],
+                    "impact": "Flat memory use as tables grow and no out-of-memory crashes"
+                })
+                
+            elif "do slow work synchronously" in item or "blocking call(s)" in item:
+                suggestions.append({
+                    "priority": "High",
+                    "title": "Move slow work out of the request",
+                    "description": "Sending mail, calling external APIs, rendering PDFs and running jobs with dispatchSync inside a controller make every user wait for them.",
+                    "steps": [
+                        f"Queue the slow work in {handler}" for handler in details.get(item, [])
+                    ] + [
+                        "Send mail with Mail::to(...)->queue() or make the Mailable implement ShouldQueue",
+                        "Move HTTP calls and PDF generation into queued jobs and notify the user when they finish",
+                        "Replace dispatchSync() with dispatch() on a real queue connection",
+                        "Run php artisan queue:work (or Horizon) in production"
+                    ],
+                    "impact": "Faster responses and no timeouts when third-party services are slow"
+                })
+                
+            elif "do not implement ShouldQueue" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Queue jobs and mailables",
+                    "description": "Jobs and Mailables that do not implement ShouldQueue run synchronously wherever they are dispatched or sent.",
+                    "steps": [
+                        f"Add implements ShouldQueue to {rel}" for rel in details.get(item, [])
+                    ] + [
+                        "Add use Illuminate\\Contracts\\Queue\\ShouldQueue; to each class",
+                        "Keep jobs that must run inline explicit with dispatchSync()"
+                    ],
+                    "impact": "Slow work runs on queue workers instead of in web requests"
+                })
+                
+            elif "blocker(s) for php artisan optimize" in item:
+                suggestions.append({
+                    "priority": "High",
+                    "title": "Make routes and config cacheable",
+                    "description": "Without route and config caching every request re-registers routes and reloads config files.",
+                    "steps": [
+                        "Replace closure routes with controller actions: [PostController::class, 'index']",
+                        "Give every named route a unique name",
+                        "Move closures out of config files (use invokable classes instead)",
+                        "Run php artisan optimize locally to confirm it succeeds",
+                        "Add php artisan optimize to your deploy script"
+                    ],
+                    "impact": "Lower per-request bootstrap time in production"
+                })
+                
+            elif "autoloader not optimized" in item:
+                suggestions.append({
+                    "priority": "Medium",
+                    "title": "Optimize the Composer autoloader",
+                    "description": "An optimized classmap avoids filesystem lookups when classes are autoloaded.",
+                    "steps": [
+                        "Add \"optimize-autoloader\": true to the config section of composer.json",
+                        "Optionally add \"classmap-authoritative\": true for production builds",
+                        "Or deploy with: composer install --optimize-autoloader --no-dev"
+                    ],
+                    "impact": "Faster class loading on every request"
+                })
+                
             elif "outdated direct dependencies" in item:
                 suggestions.append({
                     "priority": "Medium",
@@ -428,7 +776,258 @@ class LaravelQualityGUI:
             
         return suggestions
         
-    def display_results(self, results_text):
+    def toggle_suggestions(self):
+        tab = self.current_tab()
+        if tab:
+            tab.toggle_suggestions()
+            self.refresh_controls()
+            
+    def export_report(self):
+        tab = self.current_tab()
+        if not tab or not tab.assessment_results:
+            messagebox.showwarning("No Results", "No assessment results to export.")
+            return
+        tab.export_report()
+        
+    def show_comparison(self):
+        if self.compare_frame is None:
+            self.compare_frame = ctk.CTkScrollableFrame(self.tabview.add(COMPARE_TAB), label_text="Side-by-side comparison")
+            self.compare_frame.pack(fill="both", expand=True)
+        self.refresh_comparison()
+        self.tabview.set(COMPARE_TAB)
+        self.refresh_controls()
+        
+    def refresh_comparison(self):
+        """Rebuild the comparison grid: one column per assessed project, one row per check"""
+        if self.compare_frame is None:
+            return
+        for widget in self.compare_frame.winfo_children():
+            widget.destroy()
+            
+        finished = [t for t in self.tabs.values() if t.assessment_results]
+        if not finished:
+            ctk.CTkLabel(self.compare_frame, text="No finished assessments to compare yet.").grid(row=0, column=0, pady=20)
+            return
+            
+        titles = [title for title, _ in CHECKS]
+        for tab in finished:
+            titles += [title for title in tab.assessment_results["checks"] if title not in titles]
+        symbols = {"pass": ("✓", "green"), "warn": ("⚠", "orange"), "fail": ("✗", "red"), "skipped": ("○", "gray"), "error": ("⛔", "red")}
+        
+        ctk.CTkLabel(self.compare_frame, text="Check", font=ctk.CTkFont(size=12, weight="bold")).grid(row=0, column=0, sticky="w", padx=10, pady=5)
+        ctk.CTkLabel(self.compare_frame, text="Score", font=ctk.CTkFont(size=12, weight="bold")).grid(row=1, column=0, sticky="w", padx=10, pady=5)
+        for column, tab in enumerate(finished, start=1):
+            score = tab.assessment_results["score"]
+            ctk.CTkLabel(self.compare_frame, text=tab.name, font=ctk.CTkFont(size=12, weight="bold")).grid(row=0, column=column, padx=10, pady=5)
+            ctk.CTkLabel(
+                self.compare_frame,
+                text=f"{score}/100",
+                font=ctk.CTkFont(size=16, weight="bold"),
+                text_color=score_color(score)
+            ).grid(row=1, column=column, padx=10, pady=5)
+            
+        for row, title in enumerate(titles, start=2):
+            ctk.CTkLabel(self.compare_frame, text=title, font=ctk.CTkFont(size=12)).grid(row=row, column=0, sticky="w", padx=10, pady=2)
+            for column, tab in enumerate(finished, start=1):
+                record = tab.assessment_results["checks"].get(title)
+                if record is None:
+                    text, color = "–", "gray"
+                else:
+                    symbol, color = symbols.get(record["status"], ("?", "gray"))
+                    text = f"{symbol} −{record['penalty']}" if record["penalty"] > 0 else symbol
+                ctk.CTkLabel(self.compare_frame, text=text, text_color=color, font=ctk.CTkFont(size=12)).grid(row=row, column=column, padx=10, pady=2)
+                
+    def show_about(self):
+        about_text = """
+🚀 Laravel Quality Assessor GUI v1.0
+
+A modern graphical interface for analyzing Laravel project quality.
+
+Features:
+• Comprehensive code quality analysis
+• Visual score representation
+• Detailed feedback and recommendations
+• Several projects assessed side by side in tabs
+• Side-by-side comparison view
+• Export reports (JSON/HTML)
+• Modern, user-friendly interface
+
+Checks performed:
+✓ Environment configuration security
+✓ Code style and formatting tools
+✓ Test coverage and quality
+✓ Slow tests from JUnit reports
+✓ Controller complexity analysis
+✓ Form Requests usage
+✓ Migration health
+✓ Dependencies status
+✓ Blade view performance
+✓ Frontend bundle weight
+✓ Unbounded Eloquent queries
+✓ Blocking work in HTTP handlers
+✓ Production optimization readiness
+✓ Modern Laravel patterns
+
+Made with ❤️ using CustomTkinter
+        """
+        
+        about_window = ctk.CTkToplevel(self.root)
+        about_window.title("About Laravel Quality Assessor")
+        about_window.geometry("500x400")
+        about_window.transient(self.root)
+        about_window.grab_set()
+        
+        # Center the window
+        about_window.geometry("+%d+%d" % (
+            self.root.winfo_rootx() + 100,
+            self.root.winfo_rooty() + 100
+        ))
+        
+        textbox = ctk.CTkTextbox(about_window, font=ctk.CTkFont(size=12))
+        textbox.pack(fill="both", expand=True, padx=20, pady=20)
+        textbox.insert("1.0", about_text)
+        textbox.configure(state="disabled")
+        
+    def show_warning(self, message):
+        messagebox.showwarning("Warning", message)
+        
+    def show_error(self, message):
+        messagebox.showerror("Error", message)
+        
+    def run(self):
+        self.root.mainloop()
+
+class ProjectTab:
+    """One project's tab: its run on the shared pool, progress, results and suggestions.
+    
+    Methods ending up on the worker thread (run_assessment, report_progress)
+    never touch widgets; they hand their results to the main loop through post().
+    """
+    
+    def __init__(self, app, name, project_path):
+        self.app = app
+        self.root = app.root
+        self.name = name
+        self.project_path = project_path
+        self.assessment_results = None
+        self.run_control = None
+        # Guards run_control, which the worker swaps for the full run while
+        # Cancel may be reading it on the main loop
+        self.control_lock = threading.Lock()
+        self.cancel_requested = threading.Event()
+        self.future = None
+        self.running = False
+        self.closed = False
+        self.show_suggestions = False
+        
+        frame = app.tabview.add(name)
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_rowconfigure(1, weight=1)
+        
+        # Per-tab status, progress and cancellation
+        status_frame = ctk.CTkFrame(frame)
+        status_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
+        status_frame.grid_columnconfigure(1, weight=1)
+        
+        self.status_label = ctk.CTkLabel(status_frame, text="⏳ Queued", width=260, anchor="w", font=ctk.CTkFont(size=12))
+        self.status_label.grid(row=0, column=0, sticky="w", padx=10, pady=10)
+        
+        self.progress_bar = ctk.CTkProgressBar(status_frame)
+        self.progress_bar.grid(row=0, column=1, sticky="ew", padx=10, pady=10)
+        self.progress_bar.set(0)
+        
+        self.cancel_button = ctk.CTkButton(
+            status_frame,
+            text="⏹ Cancel",
+            command=self.cancel_assessment,
+            width=110,
+            state="disabled"
+        )
+        self.cancel_button.grid(row=0, column=2, sticky="e", padx=10, pady=10)
+        
+        # Results frame with scrollable content
+        self.results_frame = ctk.CTkScrollableFrame(frame, label_text=f"Assessment Results – {project_path}")
+        self.results_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
+        self.results_frame.grid_columnconfigure(0, weight=1)
+        
+        # Suggestions frame (hidden by default)
+        self.suggestions_frame = ctk.CTkScrollableFrame(frame, label_text="💡 Improvement Suggestions")
+        self.suggestions_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        self.suggestions_frame.grid_columnconfigure(0, weight=1)
+        self.suggestions_frame.grid_remove()  # Hide initially
+        
+    def post(self, callback, *args):
+        # Drop updates for a tab that was closed while its run finished
+        self.app.post(lambda: None if self.closed else callback(*args))
+        
+    def start(self, budget=None):
+        self.clear_results()
+        self.running = True
+        self.cancel_requested = threading.Event()
+        self.run_control = RunControl(budget, budget) if budget else RunControl()
+        self.status_label.configure(text="⏳ Queued")
+        self.progress_bar.set(0)
+        self.cancel_button.configure(state="normal", text="⏹ Cancel")
+        self.future = self.app.pool.submit(self.run_assessment, self.run_control, budget)
+        
+    def cancel_assessment(self):
+        """Kill running child processes and stop the remaining checks"""
+        if self.future is not None and self.future.cancel():
+            # Still queued: it never started, so nothing will report back
+            self.assessment_finished()
+            return
+        with self.control_lock:
+            self.cancel_requested.set()
+            run_control = self.run_control
+        if run_control:
+            run_control.cancel()
+            self.cancel_button.configure(state="disabled", text="⏹ Cancelling...")
+            
+    def close(self):
+        self.cancel_assessment()
+        self.closed = True
+        
+    def report_progress(self, done, total, title):
+        self.post(self.show_progress, done, total, title)
+        
+    def show_progress(self, done, total, title):
+        self.progress_bar.set(done / total)
+        if title:
+            self.status_label.configure(text=f"🔄 {title} ({done + 1}/{total})")
+            
+    def run_assessment(self, run_control, budget=None):
+        cancel_requested = self.cancel_requested
+        try:
+            results_text, result = self.app.capture_assessment(self.project_path, run_control, budget, self.report_progress)
+            assessment_results = self.app.parse_results(results_text, result, self.project_path)
+            
+            # Schedule UI update in main thread
+            self.post(self.display_results, results_text, assessment_results)
+            
+            if budget and not cancel_requested.is_set():
+                # Quick estimates are on screen; refine them with a full run
+                # in the background and replace the results when it completes
+                full_control = RunControl()
+                with self.control_lock:
+                    if cancel_requested.is_set():
+                        return
+                    self.run_control = full_control
+                self.post(self.full_run_started)
+                results_text, result = self.app.capture_assessment(self.project_path, full_control, None, self.report_progress)
+                if not full_control.cancelled.is_set():
+                    assessment_results = self.app.parse_results(results_text, result, self.project_path)
+                    self.post(self.display_results, results_text, assessment_results)
+                    
+        except Exception as e:
+            error_msg = f"An error occurred during assessment: {str(e)}"
+            self.post(self.app.show_error, error_msg)
+        finally:
+            # Stop progress and re-enable the controls
+            self.post(self.assessment_finished)
+            
+    def display_results(self, results_text, assessment_results):
+        self.assessment_results = assessment_results
+        
         # Clear existing results
         for widget in self.results_frame.winfo_children():
             widget.destroy()
@@ -443,43 +1042,21 @@ class LaravelQualityGUI:
         score_frame.grid(row=0, column=0, sticky="ew", pady=10, padx=20)
         score_frame.grid_columnconfigure(0, weight=1)
         
-        # Extract score for visualization
-        score = 0
-        for line in results_text.split('\n'):
-            if "📊 Final Score:" in line:
-                try:
-                    score_str = line.split(":")[1].strip().split("/")[0]
-                    score = int(score_str)
-                    break
-                except:
-                    pass
+        score = assessment_results["score"]
         
         score_label = ctk.CTkLabel(
             score_frame,
             text=f"📊 Overall Quality Score: {score}/100",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=ctk.CTkFont(size=24, weight="bold"),
+            text_color=score_color(score)
         )
         score_label.pack(pady=20)
         
         # Progress bar for score
-        score_progress = ctk.CTkProgressBar(score_frame, height=20)
+        score_progress = ctk.CTkProgressBar(score_frame, height=20, progress_color=score_color(score))
         score_progress.pack(pady=(0, 20), padx=20, fill="x")
         score_progress.set(score / 100)
         
-        # Color the progress bar based on score
-        if score >= 90:
-            score_progress.configure(progress_color="green")
-            score_label.configure(text_color="green")
-        elif score >= 75:
-            score_progress.configure(progress_color="orange")
-            score_label.configure(text_color="orange")
-        elif score >= 60:
-            score_progress.configure(progress_color="yellow")
-            score_label.configure(text_color="yellow")
-        else:
-            score_progress.configure(progress_color="red")
-            score_label.configure(text_color="red")
-        
         # Raw results display
         results_display = ctk.CTkTextbox(
             main_frame,
@@ -490,46 +1067,44 @@ class LaravelQualityGUI:
         results_display.insert("1.0", results_text)
         results_display.configure(state="disabled")
         
-        # Status message
-        if score >= 90:
-            status_msg = "🌟 Excellent! Your Laravel project follows best practices."
-        elif score >= 75:
-            status_msg = "👍 Good job! Minor improvements needed."
-        elif score >= 60:
-            status_msg = "🆗 Not bad, but there's room for improvement."
-        else:
-            status_msg = "⚠️ Needs work – consider refactoring and adding tests!"
-            
         status_label = ctk.CTkLabel(
             main_frame,
-            text=status_msg,
+            text=score_status(score),
             font=ctk.CTkFont(size=16, weight="bold")
         )
         status_label.grid(row=2, column=0, sticky="ew", padx=20, pady=(0, 20))
         
-        # Populate suggestions if available
-        if self.assessment_results and "suggestions" in self.assessment_results:
-            self.display_suggestions()
+        # Populate suggestions
+        self.display_suggestions()
+        self.app.refresh_comparison()
+        self.app.refresh_controls()
+        
+    def full_run_started(self):
+        self.status_label.configure(text="🔄 Full analysis...")
+        self.progress_bar.set(0)
         
     def assessment_finished(self):
-        self.progress_bar.stop()
-        self.assess_button.configure(state="normal", text="🔍 Assess Quality")
-        self.export_button.configure(state="normal")
-        self.suggestions_button.configure(state="normal")
+        self.running = False
+        with self.control_lock:
+            self.run_control = None
+        self.future = None
+        self.cancel_button.configure(state="disabled", text="⏹ Cancel")
+        if self.assessment_results:
+            self.progress_bar.set(1)
+            skipped = len(self.assessment_results["skipped"])
+            partial = f", {skipped} check(s) skipped" if skipped else ""
+            self.status_label.configure(text=f"✅ Score {self.assessment_results['score']}/100{partial}")
+        else:
+            self.status_label.configure(text="⏹ Cancelled")
+        self.app.refresh_controls()
         
     def toggle_suggestions(self):
         if self.show_suggestions:
             self.suggestions_frame.grid_remove()
             self.show_suggestions = False
-            self.suggestions_button.configure(text="💡 Show Suggestions")
-            # Adjust progress bar position
-            self.progress_bar.grid(row=5, column=0, sticky="ew", padx=20, pady=(0, 20))
         else:
             self.suggestions_frame.grid()
             self.show_suggestions = True
-            self.suggestions_button.configure(text="💡 Hide Suggestions")
-            # Adjust progress bar position when suggestions are shown
-            self.progress_bar.grid(row=5, column=0, sticky="ew", padx=20, pady=(0, 20))
             
     def display_suggestions(self):
         # Clear existing suggestions
@@ -610,7 +1185,7 @@ class LaravelQualityGUI:
                         text_color="lightgray"
                     )
                     step_label.grid(row=4+j, column=0, sticky="w", padx=30, pady=2)
-            
+                    
             # Impact
             impact_label = ctk.CTkLabel(
                 suggestion_frame,
@@ -619,12 +1194,8 @@ class LaravelQualityGUI:
                 text_color="lightgreen"
             )
             impact_label.grid(row=5+len(steps), column=0, sticky="w", padx=15, pady=(10, 15))
-        
-    def export_report(self):
-        if not self.assessment_results:
-            messagebox.showwarning("No Results", "No assessment results to export.")
-            return
             
+    def export_report(self):
         # Ask user for export format
         export_window = ctk.CTkToplevel(self.root)
         export_window.title("Export Report")
@@ -723,6 +1294,11 @@ class LaravelQualityGUI:
         .progress-bar {{ width: 100%; height: 20px; background: #3d3d3d; border-radius: 10px; overflow: hidden; margin: 20px 0; }}
         .progress-fill {{ height: 100%; background: {score_color}; transition: width 0.3s ease; }}
         .meta {{ color: #888; font-size: 14px; text-align: center; margin-top: 20px; }}
+        .assets {{ background: #2d2d2d; border-radius: 10px; padding: 20px; margin-top: 20px; }}
+        .assets table {{ width: 100%; border-collapse: collapse; }}
+        .assets th, .assets td {{ padding: 8px; border-bottom: 1px solid #3d3d3d; text-align: right; }}
+        .assets th:first-child, .assets td:first-child {{ text-align: left; }}
+        .assets .over {{ color: #F44336; font-weight: bold; }}
     </style>
 </head>
 <body>
@@ -747,6 +1323,7 @@ class LaravelQualityGUI:
             <h3>📋 Detailed Feedback</h3>
             {''.join([f'<div class="feedback-item {self.get_feedback_class(item)}">{item}</div>' for item in feedback])}
         </div>
+        {self.generate_assets_html()}
         
         <div class="meta">
             Generated by Laravel Quality Assessor GUI v1.0
@@ -757,6 +1334,39 @@ class LaravelQualityGUI:
         """
         return html
         
+    def generate_assets_html(self):
+        """Per-entry bundle sizes from the build manifest, over-budget sizes highlighted"""
+        assets = self.assessment_results.get("assets")
+        if not assets or not assets["entries"]:
+            return ""
+        budgets = assets["budgets"]
+        compression = assets["compression"]
+        
+        def kb(size, budget=None):
+            css_class = ' class="over"' if budget is not None and size > budget * 1024 else ""
+            return f"<td{css_class}>{size / 1024:.1f} KB</td>"
+            
+        # Brotli sizes are informational; budgets are scored against gzip
+        with_brotli = assets["entries"][0].get("js_brotli") is not None
+        rows = "".join(
+            f"<tr><td>{e['entry']}</td>{kb(e['js'])}{kb(e['js_compressed'], budgets['entry'])}"
+            f"{kb(e['css'])}{kb(e['css_compressed'], budgets['css'])}"
+            + (f"{kb(e['js_brotli'] + e['css_brotli'])}" if with_brotli else "")
+            + f"<td>{e['chunks']}</td><td>{e['lazy']}</td></tr>"
+            for e in assets["entries"]
+        )
+        brotli_header = "<th>JS + CSS brotli</th>" if with_brotli else ""
+        return f"""
+        <div class="assets">
+            <h3>📦 Frontend Assets ({assets['tool']}, {assets['manifest']})</h3>
+            <table>
+                <tr><th>Entry</th><th>JS</th><th>JS {compression}</th><th>CSS</th><th>CSS {compression}</th>{brotli_header}<th>Chunks up front</th><th>Lazy imports</th></tr>
+                {rows}
+            </table>
+            <div class="meta">Budgets ({compression}): {budgets['entry']:g} KB JS and {budgets['css']:g} KB CSS per entry, {budgets['chunk']:g} KB per chunk</div>
+        </div>
+        """
+        
     def get_feedback_class(self, feedback_item):
         if feedback_item.startswith("✓"):
             return "positive"
@@ -764,7 +1374,7 @@ class LaravelQualityGUI:
             return "warning"
         else:
             return "negative"
-        
+            
     def clear_results(self):
         # Clear the results frame
         for widget in self.results_frame.winfo_children():
@@ -774,71 +1384,30 @@ class LaravelQualityGUI:
         for widget in self.suggestions_frame.winfo_children():
             widget.destroy()
             
-        # Show initial message
-        self.show_initial_message()
-        
         # Reset state
         self.assessment_results = None
-        self.export_button.configure(state="disabled")
-        self.suggestions_button.configure(state="disabled")
-        
-    def show_about(self):
-        about_text = """
-🚀 Laravel Quality Assessor GUI v1.0
 
-A modern graphical interface for analyzing Laravel project quality.
+def score_color(score):
+    if score >= 90:
+        return "green"
+    elif score >= 75:
+        return "orange"
+    elif score >= 60:
+        return "yellow"
+    return "red"
 
-Features:
-• Comprehensive code quality analysis
-• Visual score representation
-• Detailed feedback and recommendations
-• Export reports (JSON/HTML)
-• Modern, user-friendly interface
-
-Checks performed:
-✓ Environment configuration security
-✓ Code style and formatting tools
-✓ Test coverage and quality
-✓ Controller complexity analysis
-✓ Form Requests usage
-✓ Migration health
-✓ Dependencies status
-✓ Modern Laravel patterns
-
-Made with ❤️ using CustomTkinter
-        """
-        
-        about_window = ctk.CTkToplevel(self.root)
-        about_window.title("About Laravel Quality Assessor")
-        about_window.geometry("500x400")
-        about_window.transient(self.root)
-        about_window.grab_set()
-        
-        # Center the window
-        about_window.geometry("+%d+%d" % (
-            self.root.winfo_rootx() + 100,
-            self.root.winfo_rooty() + 100
-        ))
-        
-        textbox = ctk.CTkTextbox(about_window, font=ctk.CTkFont(size=12))
-        textbox.pack(fill="both", expand=True, padx=20, pady=20)
-        textbox.insert("1.0", about_text)
-        textbox.configure(state="disabled")
-        
-    def show_warning(self, message):
-        messagebox.showwarning("Warning", message)
-        
-    def show_error(self, message):
-        messagebox.showerror("Error", message)
-        # Re-enable button and stop progress
-        self.assessment_finished()
-        
-    def run(self):
-        self.root.mainloop()
+def score_status(score):
+    if score >= 90:
+        return "🌟 Excellent! Your Laravel project follows best practices."
+    elif score >= 75:
+        return "👍 Good job! Minor improvements needed."
+    elif score >= 60:
+        return "🆗 Not bad, but there's room for improvement."
+    return "⚠️ Needs work – consider refactoring and adding tests!"
 
 def main():
     app = LaravelQualityGUI()
     app.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Single-pass content scanner for the Laravel Quality Assessor.
+Every registered signature is compiled into one combined pattern per file
+kind, so each file is read once (memory-mapped when large) and matched once,
+however many checks are interested in it.
+"""
+
+import os
+import re
+import mmap
+import hashlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from laravel_quality_cache import content_key
+
+# Bump when the shape of scan results changes
+SCANNER_VERSION = 3
+MMAP_MIN_BYTES = 1024 * 1024
+# Below this many files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 200
+# Files per task sent to a worker, and how often a parallel scan checks for
+# cancellation and deadlines while it waits for them
+CHUNK_FILES = 32
+CHECKPOINT_SECONDS = 0.1
+
+TOKEN_RE = re.compile(rb"[A-Za-z_]\w*")
+NEWLINE_RE = re.compile(rb"\n")
+
+
+def kind_for(path):
+    name = os.path.basename(str(path))
+    if name.endswith(".blade.php"):
+        return "blade"
+    return os.path.splitext(name)[1].lstrip(".")
+
+
+def count_newlines(data, start=0, end=None):
+    end = len(data) if end is None else end
+    if isinstance(data, bytes):
+        return data.count(b"\n", start, end)
+    # mmap has no count(); let the regex engine walk it without copying
+    return sum(1 for _ in NEWLINE_RE.finditer(data, start, end))
+
+
+class ContentScanner:
+    """Registry of named signatures matched in a single pass per file.
+
+    A signature is a regex, a list of alternative regexes, or a literal
+    (escaped into the same alternation), plus the file kinds it applies to.
+    Hits are recorded per signature as [line, *captured groups]. Signatures
+    are tried in registration order, so a more specific pattern must be
+    registered before a looser one that could match at the same offset.
+
+    Each alternative should start with a literal character: when all of them
+    do, the regex engine skips straight to candidate offsets instead of
+    trying every alternative at every byte.
+    """
+
+    def __init__(self):
+        self.signatures = []
+        self._compiled = {}
+        self._fingerprint = None
+
+    def register(self, name, pattern=None, literal=None, kinds=("php",)):
+        if literal is not None:
+            pattern = re.escape(literal)
+        alternatives = (pattern,) if isinstance(pattern, str) else tuple(pattern)
+        self.signatures.append((name, alternatives, tuple(kinds)))
+        self._compiled.clear()
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """Cache namespace that changes whenever a signature does"""
+        if self._fingerprint is None:
+            spec = repr((SCANNER_VERSION, self.signatures)).encode()
+            self._fingerprint = "lq-scan-" + hashlib.blake2b(spec, digest_size=4).hexdigest()
+        return self._fingerprint
+
+    def _combined(self, kind):
+        if kind not in self._compiled:
+            parts = []
+            groups = []
+            for i, (name, alternatives, kinds) in enumerate(self.signatures):
+                if kind not in kinds:
+                    continue
+                for j, pattern in enumerate(alternatives):
+                    # An empty marker group closes last, so it becomes the
+                    # match's lastgroup; wrapping the alternative in a group
+                    # instead would hide its leading literal from the engine
+                    parts.append(f"{pattern}(?P<_s{i}_{j}>)")
+                    groups.append((f"_s{i}_{j}", name, re.compile(pattern).groups))
+            if parts:
+                combined = re.compile("|".join(parts).encode(), re.MULTILINE)
+                dispatch = {
+                    group: (name, combined.groupindex[group] - count, count)
+                    for group, name, count in groups
+                }
+            else:
+                combined, dispatch = None, {}
+            self._compiled[kind] = (combined, dispatch)
+        return self._compiled[kind]
+
+    def scan_bytes(self, data, kind="php"):
+        combined, dispatch = self._combined(kind)
+        hits = {name: [] for name, _, kinds in self.signatures if kind in kinds}
+        if combined is not None:
+            line = 1
+            last = 0
+            for m in combined.finditer(data):
+                line += count_newlines(data, last, m.start())
+                last = m.start()
+                name, first, count = dispatch[m.lastgroup]
+                captured = [m.group(i) for i in range(first, first + count)]
+                hits[name].append([line] + [
+                    g.decode("utf-8", errors="replace") if g is not None else None for g in captured
+                ])
+        return {
+            "size": len(data),
+            "tokens": sorted(set(t.decode() for t in TOKEN_RE.findall(data))),
+            "hits": hits,
+        }
+
+    def scan_path(self, path, cache=None):
+        """Read a file once, reuse a cached result for its content or scan it.
+
+        Returns (result, from_cache).
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_MIN_BYTES:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+        try:
+            key = None
+            if cache is not None:
+                key = content_key(data, self.fingerprint())
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached, True
+            result = self.scan_bytes(data, kind_for(path))
+            if cache is not None:
+                cache.put(key, result)
+            return result, False
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def scan_files(self, paths, cache=None, checkpoint=None, pool=None):
+        """Scan many files, in worker processes when there are enough of them.
+
+        pool is a process pool shared across scans (the GUI keeps one); without
+        it a pool is started for this scan and shut down afterwards.
+        checkpoint, if given, is called between files (at least every
+        CHECKPOINT_SECONDS in parallel) and may raise to abort the scan;
+        queued work is cancelled before the exception propagates.
+        """
+        results = {}
+        paths = list(paths)
+        job = partial(_scan_job, self, cache)
+        outcomes = None
+        if len(paths) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+            own_pool = pool is None
+            if own_pool:
+                try:
+                    pool = ProcessPoolExecutor()
+                except (OSError, NotImplementedError):
+                    pool = None  # no worker processes available, fall back to serial
+            if pool is not None:
+                chunks = [paths[i:i + CHUNK_FILES] for i in range(0, len(paths), CHUNK_FILES)]
+                done = [None] * len(chunks)
+                futures = {}
+                try:
+                    futures = {pool.submit(_scan_chunk, self, cache, chunk): i for i, chunk in enumerate(chunks)}
+                    pending = set(futures)
+                    while pending:
+                        # Wake up regularly even while other scans' chunks hold
+                        # the shared pool, so cancel and deadlines are seen
+                        finished, pending = wait(pending, timeout=CHECKPOINT_SECONDS, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            done[futures[future]] = future.result()
+                        if checkpoint is not None:
+                            checkpoint()
+                    outcomes = [outcome for chunk in done for outcome in chunk]
+                except BrokenProcessPool:
+                    outcomes = None
+                finally:
+                    if own_pool:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    else:
+                        for future in futures:
+                            future.cancel()  # this scan's queued chunks only
+            if outcomes is not None and cache is not None:
+                # Workers counted into their own copies of the cache
+                reused = sum(1 for o in outcomes if o is not None and o[1])
+                cache.hits += reused
+                cache.misses += sum(1 for o in outcomes if o is not None) - reused
+        if outcomes is None:
+            outcomes = []
+            for p in paths:
+                if checkpoint is not None:
+                    checkpoint()
+                outcomes.append(job(p))
+
+        for path, outcome in zip(paths, outcomes):
+            if outcome is not None:
+                results[path] = outcome[0]
+        if cache is not None and any(o is not None and not o[1] for o in outcomes):
+            # Workers write through their own copies of the cache, whose write
+            # counters never reach the eviction threshold; enforce the size
+            # cap here once new entries have been written
+            cache.evict()
+        return results
+
+
+def _scan_chunk(scanner, cache, paths):
+    return [_scan_job(scanner, cache, path) for path in paths]
+
+
+def _scan_job(scanner, cache, path):
+    try:
+        return scanner.scan_path(path, cache)
+    except OSError:
+        return None